@@ -0,0 +1,14 @@
+"""This module provides the exceptions raised when data cannot be batched.
+"""
+
+
+class DataBatcherError(ValueError):
+    """The base class of the errors raised by a DataBatcher or BatchPlan."""
+
+
+class ShapeMismatchError(DataBatcherError):
+    """Raised when the arrays given to a DataBatcher do not have the same number of samples."""
+
+
+class BatchSizeError(DataBatcherError):
+    """Raised when a batch size is not between 1 and the number of samples in the data set."""
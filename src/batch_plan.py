@@ -0,0 +1,93 @@
+"""This module provides a single class: BatchPlan, which computes the slice bounds of every batch in an epoch.
+"""
+
+import numpy as np
+
+import batch_errors
+
+
+class BatchPlan(object):
+    """A class which plans the batches of an epoch.
+
+    The batch size is validated once when the plan is created, and the bounds of every batch are computed up front,
+    so that serving a batch from the plan needs no further checks.
+
+    Each batch is described by (start, stop, wrap): the positions start to stop of this epoch followed by the first wrap positions of the next epoch.
+    Only the last batch of an epoch can wrap.
+    """
+
+    def __init__(self, data_size, batch_size, offset=0, drop_last=False):
+        """Creates a BatchPlan.
+
+        Arguments:
+            data_size: an int describing the number of samples in an epoch.
+            batch_size: an int describing the number of samples to include in each batch.
+            offset: an int describing the position of the first sample of the epoch which has not already been batched.
+            drop_last: a bool describing whether the samples at the end of the epoch which do not fill a batch should be skipped,
+                rather than being completed with samples from the start of the next epoch.
+
+        Returns:
+            A BatchPlan object.
+        """
+        if batch_size < 1 or batch_size > data_size:
+            raise batch_errors.BatchSizeError("Please specify a batch size between 1 and the number of entries in the data set (%i)" % data_size)
+        if offset < 0 or offset >= data_size:
+            raise ValueError("The offset must be a position in the data set")
+
+        self.__batch_size = batch_size
+        if drop_last:
+            starts = offset + np.arange((data_size - offset)//batch_size)*batch_size
+            wraps = np.zeros_like(starts)
+        else:
+            # Every batch which ends before the end of the data is followed by one final batch which reaches or passes it
+            starts = offset + np.arange((data_size - offset - 1)//batch_size + 1)*batch_size
+            wraps = np.zeros_like(starts)
+            wraps[-1] = batch_size - (data_size - starts[-1])
+        stops = np.minimum(starts + batch_size, data_size)
+
+        self.__batches = list(zip(starts.tolist(), stops.tolist(), wraps.tolist()))
+        self.__next_offset = int(wraps[-1]) if len(wraps) else 0
+
+    def get_batch(self, batch_number):
+        """Returns the bounds of a batch in the epoch.
+
+        Arguments:
+            batch_number: an int describing which batch of the epoch to return the bounds of.
+
+        Returns:
+            A triple containing (start, stop, wrap). Each element is an int.
+        """
+        return self.__batches[batch_number]
+
+    def get_num_batches(self):
+        """Returns the number of batches in the epoch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int number of batches.
+        """
+        return len(self.__batches)
+
+    def get_batch_size(self):
+        """Returns the number of samples in each batch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int batch size.
+        """
+        return self.__batch_size
+
+    def get_next_offset(self):
+        """Returns the offset of the epoch which follows this one.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int describing the position of the first sample of the next epoch which is not batched by this epoch's last batch.
+        """
+        return self.__next_offset
@@ -0,0 +1,125 @@
+"""This module provides a single class: BatchPrefetcher, which prepares batches from a DataBatcher on a background thread.
+"""
+
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class BatchPrefetcher(object):
+    """A class which prefetches batches.
+
+    A background thread takes batches from a DataBatcher and places them in a bounded queue, so that the slicing,
+    1-hot expansion and copying for the next batches happens while the current batch is being used.
+
+    It also records how often the consumer had to wait for a batch (queue starvation).
+    """
+
+    def __init__(self, batcher, batch_size, num_batches_ahead=4):
+        """Creates a BatchPrefetcher and starts its background thread.
+
+        The DataBatcher should not be used by anything else while the BatchPrefetcher is running. If the DataBatcher is in epoch mode it
+        needs at least num_batches_ahead + 2 batch buffers, so that no buffer is written to while it is queued or being used.
+
+        Arguments:
+            batcher: the DataBatcher to take batches from.
+            batch_size: an int describing the number of samples to include in each batch.
+            num_batches_ahead: an int describing the maximum number of batches to prepare ahead of time.
+
+        Returns:
+            A BatchPrefetcher object.
+        """
+        if num_batches_ahead < 1:
+            raise ValueError("At least one batch must be prefetched")
+        self.__batcher = batcher
+        self.__batch_size = batch_size
+        self.__queue = queue.Queue(maxsize=num_batches_ahead)
+        self.__stop_event = threading.Event()
+
+        self.__num_batches = 0
+        self.__num_starved = 0
+        self.__wait_time = 0.0
+
+        self.__thread = threading.Thread(target=self.__produce, name='batch_prefetcher')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __produce(self):
+        """Takes batches from the DataBatcher and places them in the queue until the BatchPrefetcher is stopped.
+
+        Any exception raised while batching is placed in the queue so that it is raised again by next_batch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        while not self.__stop_event.is_set():
+            try:
+                item = self.__batcher.next_batch(self.__batch_size)
+            except Exception as excep:
+                item = excep
+            while not self.__stop_event.is_set():
+                try:
+                    self.__queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if isinstance(item, BaseException):
+                return
+
+    def next_batch(self):
+        """Returns the next prefetched batch, waiting for it if it has not been prepared yet.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A triple containing (x, y1, y2). Each element is a numpy array.
+        """
+        try:
+            item = self.__queue.get_nowait()
+        except queue.Empty:
+            # The consumer has caught up with the producer so it must wait
+            self.__num_starved += 1
+            start_time = time.time()
+            item = self.__queue.get()
+            self.__wait_time += time.time() - start_time
+        if isinstance(item, BaseException):
+            raise item
+        self.__num_batches += 1
+        return item
+
+    def get_starvation_stats(self):
+        """Returns statistics describing how often the consumer had to wait for a batch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A dictionary with the number of batches returned ('batches'), the number which had to be waited for ('starved'),
+            the fraction which had to be waited for ('starved_fraction') and the total time spent waiting in seconds ('wait_time').
+        """
+        return {'batches': self.__num_batches,
+                'starved': self.__num_starved,
+                'starved_fraction': float(self.__num_starved)/self.__num_batches if self.__num_batches else 0.0,
+                'wait_time': self.__wait_time}
+
+    def stop(self):
+        """Stops the background thread and discards any prefetched batches.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.__stop_event.set()
+        self.__thread.join()
+        while not self.__queue.empty():
+            self.__queue.get_nowait()
@@ -0,0 +1,101 @@
+"""This module provides a single class: BatchSampler, which draws the samples of each batch so that rare classes are seen more often.
+"""
+
+import numpy as np
+
+import batch_errors
+
+
+class BatchSampler(object):
+    """A class which draws the positions of the samples in each batch.
+
+    Two strategies are supported:
+        'balanced': every batch contains the same number of samples (give or take one) from each class. Each class is visited
+            in a seeded permutation which is drawn again whenever it runs out, so the samples of a rare class are repeated
+            more often than those of a common class, but within a class every sample is seen before any is repeated.
+        'weighted': the samples of every batch are drawn with replacement with a probability proportional to a weight per sample.
+            If no weights are given each sample is weighted by the inverse of the size of its class, which balances the classes on average.
+
+    Only positions are drawn, so the data itself is never duplicated.
+    """
+
+    def __init__(self, labels, strategy='balanced', weights=None, random_seed=42):
+        """Creates a BatchSampler.
+
+        Arguments:
+            labels: a numpy array containing the class of the sample at each position.
+            strategy: a string describing how to draw the samples, either 'balanced' or 'weighted'.
+            weights: a numpy array containing a non-negative weight for the sample at each position. It is only used by the 'weighted' strategy.
+            random_seed: an int used to seed the draws so that the batches are reproducable.
+
+        Returns:
+            A BatchSampler object.
+        """
+        self.__labels = np.asarray(labels)
+        self.__num_samples = self.__labels.shape[0]
+        self.__random_state = np.random.RandomState(random_seed)
+        self.__strategy = strategy
+        classes, class_sizes = np.unique(self.__labels, return_counts=True)
+
+        if strategy == 'balanced':
+            if weights is not None:
+                raise ValueError("Weights can only be used with the 'weighted' strategy")
+            self.__members = [np.flatnonzero(self.__labels == label) for label in classes]
+            self.__orders = [self.__random_state.permutation(members) for members in self.__members]
+            self.__cursors = [0]*len(classes)
+        elif strategy == 'weighted':
+            if weights is None:
+                weights = 1.0/class_sizes[np.searchsorted(classes, self.__labels)]
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (self.__num_samples,):
+                raise ValueError("There must be one weight for each sample")
+            if np.any(weights < 0) or not np.sum(weights) > 0:
+                raise ValueError("The weights must be non-negative and not all zero")
+            self.__probabilities = weights/np.sum(weights)
+        else:
+            raise ValueError("Unknown sampling strategy '%s', use 'balanced' or 'weighted'" % strategy)
+
+    def sample(self, batch_size):
+        """Draws the positions of the samples in the next batch.
+
+        Arguments:
+            batch_size: an int describing the number of samples to include in the batch.
+
+        Returns:
+            A numpy array of positions.
+        """
+        if batch_size < 1:
+            raise batch_errors.BatchSizeError("Please specify a batch size of at least 1")
+        if self.__strategy == 'weighted':
+            return self.__random_state.choice(self.__num_samples, size=batch_size, p=self.__probabilities)
+
+        # Share the batch equally between the classes, giving any remainder to randomly chosen classes
+        num_classes = len(self.__members)
+        quotas = np.full(num_classes, batch_size//num_classes, dtype=np.intp)
+        quotas[self.__random_state.choice(num_classes, batch_size % num_classes, replace=False)] += 1
+        positions = np.concatenate([self.__draw_from_class(label, quota) for (label, quota) in enumerate(quotas)])
+        return self.__random_state.permutation(positions)
+
+    def __draw_from_class(self, label, quota):
+        """Draws the next positions from a class's permutation, drawing a new permutation each time it runs out.
+
+        Arguments:
+            label: an int describing which of the classes to draw from.
+            quota: an int describing the number of positions to draw.
+
+        Returns:
+            A numpy array of positions.
+        """
+        drawn = []
+        while quota > 0:
+            order = self.__orders[label]
+            cursor = self.__cursors[label]
+            number_taken = min(quota, len(order) - cursor)
+            drawn.append(order[cursor:cursor + number_taken])
+            quota -= number_taken
+            if cursor + number_taken == len(order):
+                self.__orders[label] = self.__random_state.permutation(self.__members[label])
+                self.__cursors[label] = 0
+            else:
+                self.__cursors[label] = cursor + number_taken
+        return np.concatenate(drawn) if drawn else np.empty(0, dtype=np.intp)
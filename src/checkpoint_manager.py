@@ -0,0 +1,221 @@
+"""This module provides a single class: CheckpointManager, which saves the best model on a background thread.
+"""
+
+import math
+import threading
+import time
+
+import tensorflow as tf
+
+
+class CheckpointManager(object):
+    """A class which checkpoints the best model found during training.
+
+    Only a model whose metric is better than the best so far is checkpointed. Its variables are copied on the training thread,
+    which is cheap, and written to disk on a background thread from a separate graph and session, so training is not stalled by the disk.
+
+    Saves are rate limited by wall-clock time. A new best model which arrives too soon after the last save is held in memory,
+    replacing any older one which is also waiting, and it is written once enough time has passed or when finish is called.
+    Only the last few checkpoints are kept on disk.
+    """
+
+    def __init__(self, checkpoint_path, variables=None, max_to_keep=5, min_save_interval=30.0):
+        """Creates a CheckpointManager and starts its background thread.
+
+        Arguments:
+            checkpoint_path: a string describing the path prefix of the checkpoint files. The step is appended to each checkpoint.
+            variables: a list of the variables to checkpoint. If it is None the trainable variables are checkpointed.
+            max_to_keep: an int describing the number of most recent checkpoints to keep.
+            min_save_interval: a float describing the minimum number of seconds between the starts of two saves.
+
+        Returns:
+            A CheckpointManager object.
+        """
+        self.__checkpoint_path = checkpoint_path
+        self.__variables = tf.trainable_variables() if variables is None else variables
+        self.__min_save_interval = min_save_interval
+
+        # The checkpoint uses the names of the variables being trained, so it can be restored into them directly
+        self.__restorer = tf.train.Saver(self.__variables)
+        self.__shadow_graph = tf.Graph()
+        with self.__shadow_graph.as_default():
+            self.__placeholders = [tf.placeholder(variable.dtype.base_dtype, variable.get_shape()) for variable in self.__variables]
+            shadows = [tf.Variable(tf.zeros(variable.get_shape(), variable.dtype.base_dtype)) for variable in self.__variables]
+            self.__assign = [shadow.assign(placeholder) for (shadow, placeholder) in zip(shadows, self.__placeholders)]
+            self.__saver = tf.train.Saver(dict((variable.op.name, shadow) for (variable, shadow) in zip(self.__variables, shadows)),
+                                          max_to_keep=max_to_keep)
+            self.__shadow_sess = tf.Session()
+            self.__shadow_sess.run(tf.initialize_all_variables())
+
+        self.__best_metric = None
+        self.__best_step = None
+        self.__best_path = None
+        self.__pending = None
+        self.__last_save_time = None
+        self.__num_saves = 0
+        self.__error = None
+
+        self.__condition = threading.Condition()
+        self.__request = None
+        self.__writing = False
+        self.__stopping = False
+        self.__thread = threading.Thread(target=self.__write_requests, name='checkpoint_manager')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def update(self, sess, step, metric, snapshot=None):
+        """Records the metric of the model at a training step, and checkpoints the model if it is the best so far.
+
+        Arguments:
+            sess: the TensorFlow session being trained in.
+            step: an int describing the training step.
+            metric: a float describing how good the model is. Higher is better. A NaN metric, such as the accuracy of a model
+                which predicts nothing, is never the best.
+            snapshot: a list containing the value of each variable at the step, for example from an asynchronous evaluation,
+                or None to copy the current values of the variables.
+
+        Returns:
+            A bool which is True if the model is the best so far.
+        """
+        if math.isnan(metric) or (self.__best_metric is not None and metric <= self.__best_metric):
+            self.poll()
+            return False
+        self.__best_metric = metric
+        self.__best_step = step
+        if snapshot is None:
+            snapshot = sess.run(self.__variables)
+        self.__pending = (step, snapshot)
+        self.poll()
+        return True
+
+    def poll(self):
+        """Hands the waiting best model to the background thread if the last save was long enough ago and has finished.
+
+        It is cheap enough to be called every training step.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.__raise_error()
+        if self.__pending is None:
+            return
+        if self.__last_save_time is not None and time.time() - self.__last_save_time < self.__min_save_interval:
+            return
+        self.__hand_over_pending()
+
+    def __hand_over_pending(self):
+        """Hands the waiting best model to the background thread unless it is still writing the last one.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.__condition:
+            if self.__writing or self.__request is not None:
+                return
+            self.__request, self.__pending = self.__pending, None
+            self.__last_save_time = time.time()
+            self.__condition.notify()
+
+    def __write_requests(self):
+        """Writes the requested checkpoints until the CheckpointManager is finished.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        while True:
+            with self.__condition:
+                while self.__request is None and not self.__stopping:
+                    self.__condition.wait()
+                if self.__request is None:
+                    return
+                (step, snapshot), self.__request = self.__request, None
+                self.__writing = True
+            try:
+                self.__shadow_sess.run(self.__assign, feed_dict=dict(zip(self.__placeholders, snapshot)))
+                path = self.__saver.save(self.__shadow_sess, self.__checkpoint_path, global_step=step)
+                with self.__condition:
+                    self.__best_path = path
+                    self.__num_saves += 1
+            except Exception as excep:
+                self.__error = excep
+            with self.__condition:
+                self.__writing = False
+                self.__condition.notify_all()
+
+    def __raise_error(self):
+        """Raises any error from the background thread on the calling thread.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def finish(self):
+        """Writes the waiting best model, if there is one, regardless of the rate limit, then stops the background thread.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.__condition:
+            while self.__writing or self.__request is not None:
+                self.__condition.wait()
+            if self.__pending is not None:
+                self.__request, self.__pending = self.__pending, None
+            self.__stopping = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        self.__shadow_sess.close()
+        self.__raise_error()
+
+    def restore_best(self, sess):
+        """Restores the best checkpointed model into the variables being trained. finish must be called first.
+
+        Arguments:
+            sess: the TensorFlow session being trained in.
+
+        Returns:
+            An int describing the training step of the restored model, or None if no model was checkpointed.
+        """
+        if self.__best_path is None:
+            return None
+        self.__restorer.restore(sess, self.__best_path)
+        return self.__best_step
+
+    def get_best(self):
+        """Returns the best metric recorded and the training step it was recorded at.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A pair containing (step, metric), each of which is None if nothing has been recorded.
+        """
+        return (self.__best_step, self.__best_metric)
+
+    def get_num_saves(self):
+        """Returns the number of checkpoints which have been written.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int number of checkpoints.
+        """
+        return self.__num_saves
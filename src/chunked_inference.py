@@ -0,0 +1,74 @@
+"""This module provides a single class: ChunkedInference, which evaluates a model on a whole data set one chunk at a time.
+"""
+
+import numpy as np
+
+import snp_scorer
+
+
+class ChunkedInference(object):
+    """A class which streams a data set through a model in fixed size chunks and combines the results of the chunks.
+
+    Feeding the whole data set in one sess.run needs the activations of every sample at once. Here only one chunk is expanded and
+    run at a time, so the memory needed is bounded by the chunk size however large the data set is.
+
+    The results are the same as a single run over the whole data set would give. Output 1's accuracy and both losses are means,
+    so they are averaged weighted by the size of each chunk. The SNP accuracy is not a mean, so the graph's true positive, false
+    positive and false negative counts of each chunk are summed and the accuracy is found from the totals. The SNPs are scored by
+    a SnpScorer from the graph's per SNP reductions. Only scalars and per SNP vectors are fetched from each chunk.
+    """
+
+    def __init__(self, sess, inputs, keep_prob, accuracy1, losses, snp_counts, snp_scores):
+        """Creates a ChunkedInference.
+
+        Arguments:
+            sess: the TensorFlow session to evaluate in.
+            inputs: a triple containing the (x, y1, y2) tensors which each chunk is fed to.
+            keep_prob: the dropout keep probability tensor, which is fed 1.0.
+            accuracy1: the tensor of the accuracy of output 1.
+            losses: a pair containing the (loss1, loss2) tensors.
+            snp_counts: a triple containing the (true_positives, false_positives, false_negatives) tensors of the SNP predictions.
+            snp_scores: a pair containing the (probability_sums, counts) tensors of each SNP.
+
+        Returns:
+            A ChunkedInference object.
+        """
+        self.__sess = sess
+        self.__inputs = inputs
+        self.__keep_prob = keep_prob
+        self.__fetches = [accuracy1, losses[0], losses[1], list(snp_counts), list(snp_scores)]
+
+    def run(self, batcher, chunk_size, run_args=None):
+        """Evaluates the model on every sample of a DataBatcher.
+
+        Arguments:
+            batcher: the DataBatcher holding the data to evaluate on.
+            chunk_size: an int describing the maximum number of samples to run at once.
+            run_args: a dictionary of extra keyword arguments for the sess.run of the first chunk, for example to trace it, or None.
+
+        Returns:
+            A tuple containing (accuracy1, accuracy2, loss1, loss2, scorer). The scorer is a SnpScorer holding the scores of every SNP.
+        """
+        num_samples = 0
+        totals = np.zeros(3)
+        snp_counts = np.zeros(3, dtype=np.int64)
+        scorer = snp_scorer.SnpScorer()
+
+        for (x_chunk, y1_chunk, y2_chunk) in batcher.get_chunks(chunk_size):
+            feed_dict = {self.__inputs[0]: x_chunk, self.__inputs[1]: y1_chunk, self.__inputs[2]: y2_chunk, self.__keep_prob: 1.0}
+            acc1, cost1, cost2, chunk_snp_counts, (probability_sums, counts) = self.__sess.run(self.__fetches, feed_dict=feed_dict,
+                                                                                                **(run_args or {}))
+            run_args = None
+            chunk_samples = len(x_chunk)
+
+            # The means over a chunk are weighted by its size so that they combine to the mean over the whole data set
+            totals += chunk_samples*np.array([acc1, cost1, cost2])
+            snp_counts += chunk_snp_counts
+            scorer.update(probability_sums, counts, chunk_samples)
+            num_samples += chunk_samples
+
+        (accuracy1, loss1, loss2) = totals/num_samples
+        (true_positives, false_positives, false_negatives) = snp_counts
+        all_predictions = true_positives + false_positives + false_negatives
+        accuracy2 = float(true_positives)/all_predictions if all_predictions else float('nan')
+        return (accuracy1, accuracy2, loss1, loss2, scorer)
@@ -1,24 +1,43 @@
-"""This module provides a single class: DataLoader, which manages reading of raw data and formatting is appropriately.
+"""This module provides a single class: DataBatcher, which provides batches of data in order.
 """
 
-import sys
-
 import numpy as np
 
+import batch_errors
+import batch_plan
+import batch_sampler
+import data_loader
 
 class DataBatcher(object):
     """A class which batches data.
 
     After being initialised with a large amount of data this class provides functionality for accessing small batches of the data in order.
+
+    In compact mode the data is held as int8 genotype codes and labels, and each batch is only expanded to a 1-hot encoding when it is requested.
+    If a causal SNP mask is given in compact mode, y2 is not stored at all and is derived from the batch's case/control labels instead.
+
+    If an index vector is given the arrays are treated as shared storage and only the samples at those indices (in that order) are batched.
+    This allows several DataBatchers, for example one per cross validation fold, to share one copy of the data.
+
+    By default the samples are batched in the same order every epoch. After set_epoch_mode has been called the samples are visited in a new
+    seeded permutation each epoch and every batch is gathered into a preallocated buffer, so no new arrays are allocated at epoch boundaries.
+    After set_sampler has been called the samples of each batch are drawn by a BatchSampler instead, for example to balance the classes.
+
+    With binary SNP labels output 2 has a single 'causing epi' state per SNP rather than a 1-hot pair, for models with a per SNP sigmoid head.
     """
 
-    def __init__(self, x, y1, y2):
+    def __init__(self, x, y1, y2, compact=False, causal_mask=None, indices=None, dtype=data_loader.DEFAULT_DTYPE, binary_snp_labels=False):
         """Creates a DataBatcher.
 
         Arguments:
             x: a numpy array containing all of the input data.
             y1: a numpy array containing all of the output 1 data.
-            y2: a numpy array containing all of the output 2 data.
+            y2: a numpy array containing all of the output 2 data. This may be None in compact mode if a causal_mask is given.
+            compact: a bool describing whether x, y1 and y2 are compact codes with shapes (samples, loci), (samples,) and (samples, loci) rather than 1-hot arrays.
+            causal_mask: a boolean numpy array with one entry per SNP describing which SNPs cause epistasis. It is only used in compact mode.
+            indices: a numpy array of the sample indices to batch from the given arrays. If it is None every sample is batched in order.
+            dtype: the numpy data type which compact batches are expanded to. 1-hot arrays are batched in their own type.
+            binary_snp_labels: a bool describing whether to give output 2 only its 'causing epi' state, with shape (samples, loci, 1).
 
         Returns:
             A DataBatcher object.
@@ -26,17 +45,86 @@ class DataBatcher(object):
         self.__x = x
         self.__y1 = y1
         self.__y2 = y2
+        self.__compact = compact
+        self.__causal_mask = causal_mask
+        self.__indices = indices
+        self.__dtype = dtype
+        self.__binary_snp_labels = binary_snp_labels
         self.__batch_cursor = 0
-        self.__data_size = self.__x.shape[0]
+        self.__data_size = self.__x.shape[0] if indices is None else len(indices)
         self.__num_epochs = 0
+        self.__epoch_mode = False
+        self.__plan = None
+        self.__plans = {}
+        self.__batch_number = 0
+        self.__sampler = None
+
+        if self.__x.shape[0] != self.__y1.shape[0]:
+            raise batch_errors.ShapeMismatchError("The input and output sets must have the same number of entries")
 
-        if self.__data_size != self.__y1.shape[0]:
-            print("The input and output sets must have the same number of entries")
-            sys.exit(2)
+        if self.__y2 is None:
+            if not self.__compact or self.__causal_mask is None:
+                raise batch_errors.DataBatcherError("Output 2 can only be derived in compact mode with a causal SNP mask")
+        elif self.__y2.shape[0] != self.__y1.shape[0]:
+            raise batch_errors.ShapeMismatchError("The output sets must have the same number of entries")
+
+        if binary_snp_labels and not compact and y2 is not None and y2.shape[-1] == 2:
+            # Only the 'causing epi' state of 1-hot SNP labels is batched. It is a view, so nothing is copied.
+            self.__y2 = y2[..., :1]
+
+        # Only the arrays which are actually stored need to be sliced when batching
+        self.__stored = [array for array in (self.__x, self.__y1, self.__y2) if array is not None]
+
+    def set_epoch_mode(self, shuffle=True, random_seed=42, drop_last=False, num_buffers=1):
+        """Switches to epoch-aware batching, in which every batch is gathered into a reusable preallocated buffer.
+
+        A returned batch is only valid until num_buffers further batches have been taken, as its buffer is then written to again.
+        In compact mode this does not matter as every batch is expanded into new 1-hot arrays.
+
+        Arguments:
+            shuffle: a bool describing whether the samples should be visited in a new seeded permutation each epoch.
+            random_seed: an int used to seed the permutations so that the order of the batches is reproducable.
+            drop_last: a bool describing whether the samples left at the end of an epoch which do not fill a batch should be skipped,
+                rather than being completed with samples from the start of the next epoch.
+            num_buffers: an int describing how many batch buffers to cycle through. Consumers which hold on to several batches at once,
+                such as a BatchPrefetcher, need more than one.
 
-        if self.__y2.shape[0] != self.__y1.shape[0]:
-            print("The output sets must have the same number of entries")
-            sys.exit(2)
+        Returns:
+            Nothing.
+        """
+        if num_buffers < 1:
+            raise ValueError("At least one batch buffer is required")
+        self.__epoch_mode = True
+        self.__shuffle = shuffle
+        self.__random_state = np.random.RandomState(random_seed)
+        self.__drop_last = drop_last
+        self.__buffers = [None]*num_buffers
+        self.__buffer_index = 0
+        self.__batch_cursor = 0
+        self.__plan = None
+        self.__plans = {}
+        self.__epoch_order = self.__new_epoch_order()
+
+    def set_sampler(self, strategy='balanced', weights=None, random_seed=42):
+        """Switches to drawing the samples of each batch with a BatchSampler, so that rare classes can be seen more often.
+
+        An epoch is counted each time as many samples have been drawn as there are in the data set.
+
+        Arguments:
+            strategy: a string describing how to draw the samples, either 'balanced' or 'weighted'. See BatchSampler.
+            weights: a numpy array containing a weight for each sample batched by this DataBatcher, in batching order. If it is None
+                the 'weighted' strategy weights each sample by the inverse of the size of its class.
+            random_seed: an int used to seed the draws so that the batches are reproducable.
+
+        Returns:
+            Nothing.
+        """
+        labels = self.__y1 if self.__indices is None else self.__y1[self.__indices]
+        if labels.ndim > 1:
+            # 1-hot labels have the case/control state as their last axis
+            labels = np.argmax(labels, axis=-1)
+        self.__sampler = batch_sampler.BatchSampler(labels, strategy, weights, random_seed)
+        self.__num_sampled = 0
 
     def next_batch(self, batch_size):
         """Returns the next batch of the data.
@@ -50,32 +138,184 @@ class DataBatcher(object):
         # If the caller wants all of the data simply return the whole data set as a triple
         if batch_size is None:
             self.__num_epochs += 1
-            return (self.__x, self.__y1, self.__y2)
-
-        if batch_size > self.__data_size:
-            print("Please specify a batch size less than the number of entries in the data set")
-            sys.exit(2)
-
-        if batch_size + self.__batch_cursor < self.__data_size:
-            # If the batch size is less than the number of entries left in the data:
-            # Take the next batch size number of elements and move the cursor forwards.
-            x_batch = self.__x[self.__batch_cursor:batch_size + self.__batch_cursor]
-            y1_batch = self.__y1[self.__batch_cursor:batch_size + self.__batch_cursor]
-            y2_batch = self.__y2[self.__batch_cursor:batch_size + self.__batch_cursor]
-            self.__batch_cursor = self.__batch_cursor + batch_size
+            return self.__expand(*self.__take(0, self.__data_size))
+
+        if self.__sampler is not None:
+            positions = self.__sampler.sample(batch_size)
+            rows = positions if self.__indices is None else self.__indices[positions]
+            self.__num_epochs += (self.__num_sampled + batch_size)//self.__data_size - self.__num_sampled//self.__data_size
+            self.__num_sampled += batch_size
+            return self.__expand(*[array[rows] for array in self.__stored])
+
+        # The batch size is only validated when the epoch is planned, and again if it changes
+        if self.__plan is None or self.__plan.get_batch_size() != batch_size:
+            self.__plan = self.__get_plan(batch_size, self.__batch_cursor)
+            self.__batch_number = 0
+        while self.__batch_number == self.__plan.get_num_batches():
+            # Nothing of the epoch is left to batch, which can only happen if the remaining samples are dropped
+            self.__start_new_epoch()
+
+        (start, stop, wrap) = self.__plan.get_batch(self.__batch_number)
+        self.__batch_number += 1
+        last_batch_of_epoch = self.__batch_number == self.__plan.get_num_batches()
+
+        if self.__epoch_mode:
+            batch = self.__get_buffer(batch_size)
+            self.__gather(batch, 0, self.__epoch_order[start:stop])
+            if last_batch_of_epoch:
+                self.__start_new_epoch()
+            else:
+                self.__batch_cursor = stop
+            if wrap:
+                # Fill the rest of the buffer from the start of the next epoch
+                self.__gather(batch, stop - start, self.__epoch_order[:wrap])
         else:
-            # If there is not enough data left then take the remaining data from the end and start again at the begining.
-            x_batch = self.__x[self.__batch_cursor:]
-            y1_batch = self.__y1[self.__batch_cursor:]
-            y2_batch = self.__y2[self.__batch_cursor:]
-            number_still_required = batch_size - (self.__data_size - self.__batch_cursor)
-            x_batch = np.concatenate((x_batch, self.__x[0:number_still_required]))
-            y1_batch = np.concatenate((y1_batch, self.__y1[0:number_still_required]))
-            y2_batch = np.concatenate((y2_batch, self.__y2[0:number_still_required]))
-            self.__batch_cursor = number_still_required
-            self.__num_epochs += 1
+            if not wrap:
+                batch = self.__take(start, stop)
+            elif self.__indices is not None:
+                batch = [array[np.concatenate((self.__indices[start:stop], self.__indices[0:wrap]))] for array in self.__stored]
+            else:
+                batch = [np.concatenate((array[start:stop], array[0:wrap])) for array in self.__stored]
+            if last_batch_of_epoch:
+                self.__start_new_epoch()
+            else:
+                self.__batch_cursor = stop
+
+        return self.__expand(*batch)
+
+    def get_chunks(self, chunk_size):
+        """Yields the whole data set, in order, as consecutive chunks. The position of next_batch and the epoch count are unchanged.
+
+        Only one chunk is expanded to a 1-hot encoding at a time, so the memory needed does not grow with the size of the data set.
+
+        Arguments:
+            chunk_size: an int describing the maximum number of samples in each chunk. The last chunk holds whatever is left.
+
+        Returns:
+            A generator of triples containing (x, y1, y2). Each element is a numpy array.
+        """
+        if chunk_size < 1:
+            raise batch_errors.BatchSizeError("The chunk size must be at least 1, but it is %i" % chunk_size)
+        for start in range(0, self.__data_size, chunk_size):
+            yield self.__expand(*self.__take(start, min(start + chunk_size, self.__data_size)))
+
+    def __get_plan(self, batch_size, offset):
+        """Returns the plan of the batches of an epoch, creating it if it has not been used before.
+
+        Arguments:
+            batch_size: an int describing the number of samples to include in each batch.
+            offset: an int describing the position of the first sample of the epoch which has not already been batched.
+
+        Returns:
+            A BatchPlan object.
+        """
+        key = (batch_size, offset)
+        if key not in self.__plans:
+            self.__plans[key] = batch_plan.BatchPlan(self.__data_size, batch_size, offset, self.__epoch_mode and self.__drop_last)
+        return self.__plans[key]
+
+    def __start_new_epoch(self):
+        """Counts the epoch which has just finished, plans the next one and, in epoch mode, chooses the order of its samples.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.__num_epochs += 1
+        self.__batch_cursor = self.__plan.get_next_offset()
+        self.__plan = self.__get_plan(self.__plan.get_batch_size(), self.__batch_cursor)
+        self.__batch_number = 0
+        if self.__epoch_mode:
+            self.__epoch_order = self.__new_epoch_order()
+
+    def __new_epoch_order(self):
+        """Returns the row of each stored array to visit at each position of an epoch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A numpy array of row indices.
+        """
+        if self.__shuffle:
+            order = self.__random_state.permutation(self.__data_size)
+        else:
+            order = np.arange(self.__data_size)
+        if self.__indices is not None:
+            return self.__indices[order]
+        return order
+
+    def __get_buffer(self, batch_size):
+        """Returns the next batch buffer in the cycle, allocating it if it has not been used for this batch size before.
+
+        Arguments:
+            batch_size: an int describing the number of samples in the batch.
+
+        Returns:
+            A list containing a numpy array for each of the stored arrays.
+        """
+        buffer = self.__buffers[self.__buffer_index]
+        if buffer is None or buffer[0].shape[0] != batch_size:
+            buffer = [np.empty((batch_size,) + array.shape[1:], dtype=array.dtype) for array in self.__stored]
+            self.__buffers[self.__buffer_index] = buffer
+        self.__buffer_index = (self.__buffer_index + 1) % len(self.__buffers)
+        return buffer
+
+    def __gather(self, batch, start, rows):
+        """Copies rows of each stored array into a batch buffer.
+
+        Arguments:
+            batch: a list containing a batch buffer for each of the stored arrays.
+            start: an int describing the position in the batch buffers to copy the first row to.
+            rows: a numpy array of the rows to copy.
+
+        Returns:
+            Nothing.
+        """
+        for (array, buffer) in zip(self.__stored, batch):
+            np.take(array, rows, axis=0, out=buffer[start:start + len(rows)])
+
+    def __take(self, start, stop):
+        """Takes the samples between two positions of the data set from each of the stored arrays.
+
+        Arguments:
+            start: an int describing the position of the first sample to take.
+            stop: an int describing the position after the last sample to take.
 
-        return (x_batch, y1_batch, y2_batch)
+        Returns:
+            A list containing a numpy array for each of the stored arrays.
+        """
+        if self.__indices is not None:
+            return [array[self.__indices[start:stop]] for array in self.__stored]
+        if start == 0 and stop == self.__data_size:
+            return self.__stored
+        return [array[start:stop] for array in self.__stored]
+
+    def __expand(self, x_batch, y1_batch, y2_batch=None):
+        """Expands a batch of compact codes to a 1-hot encoding. Batches which are already 1-hot are returned unchanged.
+
+        Arguments:
+            x_batch: a numpy array containing a batch of the input data.
+            y1_batch: a numpy array containing a batch of the output 1 data.
+            y2_batch: a numpy array containing a batch of the output 2 data, or None if it should be derived from y1_batch and the causal SNP mask.
+
+        Returns:
+            A triple containing (x, y1, y2). Each element is a numpy array.
+        """
+        if not self.__compact:
+            return (x_batch, y1_batch, y2_batch)
+        if y2_batch is None:
+            # A SNP causes epistasis in a sample if the sample is a case and the SNP is causal
+            y2_batch = np.outer(y1_batch == 1, self.__causal_mask)
+        if self.__binary_snp_labels:
+            y2_batch = data_loader.snp_labels_to_binary(y2_batch, self.__dtype)
+        else:
+            y2_batch = data_loader.snp_labels_to_1_hot(y2_batch, self.__dtype)
+        return (data_loader.genotypes_to_1_hot(x_batch, self.__dtype),
+                data_loader.labels_to_1_hot(y1_batch, self.__dtype),
+                y2_batch)
 
     def get_input_shape(self):
         """ Returns the tensor shape of the input data.
@@ -86,7 +326,9 @@ class DataBatcher(object):
         Returns:
             An n-tuple containing the integer dimension sizes of the input data.
         """
-        return self.__x.shape
+        if self.__compact:
+            return (self.__data_size,) + self.__x.shape[1:] + (3,)
+        return (self.__data_size,) + self.__x.shape[1:]
 
     def get_output1_shape(self):
         """ Returns the tensor shape of the output 1 data.
@@ -97,7 +339,9 @@ class DataBatcher(object):
         Returns:
             An n-tuple containing the integer dimension sizes of the output 1 data.
         """
-        return self.__y1.shape
+        if self.__compact:
+            return (self.__data_size,) + self.__y1.shape[1:] + (2,)
+        return (self.__data_size,) + self.__y1.shape[1:]
 
     def get_output2_shape(self):
         """ Returns the tensor shape of the output 2 data.
@@ -108,7 +352,25 @@ class DataBatcher(object):
         Returns:
             An n-tuple containing the integer dimension sizes of the output 2 data.
         """
-        return self.__y2.shape
+        if self.__compact:
+            num_states = 1 if self.__binary_snp_labels else 2
+            if self.__y2 is None:
+                return (self.__data_size, self.__causal_mask.shape[0], num_states)
+            return (self.__data_size,) + self.__y2.shape[1:] + (num_states,)
+        return (self.__data_size,) + self.__y2.shape[1:]
+
+    def get_dtype(self):
+        """Returns the numpy data type of the batches.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A numpy dtype.
+        """
+        if self.__compact:
+            return np.dtype(self.__dtype)
+        return self.__x.dtype
 
     def get_num_epochs(self):
         """Returns the number of epochs of data that have been batched.
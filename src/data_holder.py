@@ -1,28 +1,35 @@
 """This module provides a single class: DataHolder, which manages reading of input files and storage of various data sets.
 """
 
+import os
+
 import numpy as np
 
 import data_batcher
 import data_loader
+import data_splitter
 
 class DataHolder(object):
     """A class to hold various data sets.
 
     The DataHolder contains the training, testing, and validation data sets.
 
-    It provides functionality for reading from .txt and .npz (binary) files.
-    It also provides functionality for writing .npz files for later use.
+    It provides functionality for reading from .txt, .npz (binary) files and directories of memory-mappable .npy files.
+    The data can be held either as 1-hot arrays or as compact int8 genotype codes which are expanded to 1-hot one batch at a time.
+    It also provides functionality for writing .npz files and .npy directories for later use.
     Finaly it proves functionality for accessing the data sets described above.
+
+    The data is stored once, and each data set is a DataBatcher over that storage and an index vector.
+    The same storage can be re-split, or used to build DataBatchers for other splits such as the folds of k-fold cross validation.
     """
 
-    def __init__(self):
+    def __init__(self, binary_snp_labels=False):
         """Creates a DataLoader.
 
         All data mebers are initialised as None.
 
         Arguments:
-            None.
+            binary_snp_labels: A bool describing whether the data sets give output 2 a single 'causing epi' state per SNP rather than a 1-hot pair.
 
         Returns:
             a DataLoader object.
@@ -32,31 +39,91 @@ class DataHolder(object):
         self.__validation = None
         self.__headers = None
         self.__data_loader = None
+        self.__compact = False
+        self.__causal_mask = None
+        self.__x = None
+        self.__y1 = None
+        self.__y2 = None
+        self.__labels = None
+        self.__split_indices = None
+        self.__dtype = data_loader.DEFAULT_DTYPE
+        self.__binary_snp_labels = binary_snp_labels
 
-    def read_from_txt(self, file_name_and_path, test_train_ratio=0.8, valid_train_ratio=0.75):
+    def read_from_txt(self, file_name_and_path, test_train_ratio=0.8, valid_train_ratio=0.75, compact=False, legacy_split=False, stratified=False,
+                      dtype=data_loader.DEFAULT_DTYPE):
         """Reads a data set from a .txt file, storing it as three data sets: training, testing, and validation.
 
         Arguments:
             file_name_and_path: A string describing the file name (and relative path) of the .txt file to read.
             test_train_ratio: A float describing how much of the data to use for training and how much to use for testing.
             valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation.
+            compact: A bool describing whether to keep the data as int8 codes and only expand each batch to 1-hot when it is requested.
+            legacy_split: A bool describing whether to reproduce the exact split made by earlier versions.
+            stratified: A bool describing whether each data set should keep the ratio of cases to controls of the whole data set.
+            dtype: The numpy data type of the 1-hot data, for example np.float32 or np.uint8.
 
         Returns:
             Nothing.
         """
-        self.__data_loader = data_loader.DataLoader(file_name_and_path, test_train_ratio, valid_train_ratio)
-        self.__data_loader.convert_data_to_1_hot()
-        self.__data_loader.split_data()
-        training_x, training_y1, training_y2 = self.__data_loader.get_training_data()
-        self.__training = data_batcher.DataBatcher(training_x, training_y1, training_y2)
-        testing_x, testing_y1, testing_y2 = self.__data_loader.get_testing_data()
-        self.__testing = data_batcher.DataBatcher(testing_x, testing_y1, testing_y2)
-        validation_x, validation_y1, validation_y2 = self.__data_loader.get_validation_data()
-        self.__validation = data_batcher.DataBatcher(validation_x, validation_y1, validation_y2)
+        self.__compact = compact
+        self.__dtype = dtype
+        self.__data_loader = data_loader.DataLoader(file_name_and_path, test_train_ratio, valid_train_ratio, dtype=dtype)
+        if not compact:
+            self.__data_loader.convert_data_to_1_hot()
+        self.__data_loader.split_data(legacy_split, stratified)
+        self.__labels = self.__data_loader.get_compact_data()[1]
+        if compact:
+            self.__causal_mask = self.__data_loader.get_causal_mask()
+            self.__x, self.__y1 = self.__data_loader.get_compact_data()
+            self.__y2 = None
+        else:
+            self.__causal_mask = None
+            self.__x, self.__y1, self.__y2 = self.__data_loader.get_1_hot_data()
+        self.__use_split(*self.__data_loader.get_split_indices())
         self.__headers = self.__data_loader.get_header_data()
 
+    def split_data(self, test_train_ratio, valid_train_ratio, stratified=False):
+        """Re-splits the stored data into new training, testing and validation data sets.
+
+        Arguments:
+            test_train_ratio: A float describing how much of the data to use for training and how much to use for testing.
+            valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation.
+            stratified: A bool describing whether each data set should keep the ratio of cases to controls of the whole data set.
+
+        Returns:
+            Nothing.
+        """
+        if self.__labels is None:
+            raise ValueError("The full data set is not stored. Binaries which only contain the split data sets cannot be re-split.")
+        splitter = data_splitter.DataSplitter(self.__labels)
+        if stratified:
+            self.__use_split(*splitter.stratified_split(test_train_ratio, valid_train_ratio))
+        else:
+            self.__use_split(*splitter.random_split(test_train_ratio, valid_train_ratio))
+
+    def __use_split(self, training_indices, validation_indices, testing_indices):
+        """Creates the training, testing and validation DataBatchers over the stored data from their sample indices.
+
+        Arguments:
+            training_indices: a numpy array of the training sample indices.
+            validation_indices: a numpy array of the validation sample indices.
+            testing_indices: a numpy array of the testing sample indices.
+
+        Returns:
+            Nothing.
+        """
+        self.__split_indices = (training_indices, validation_indices, testing_indices)
+        self.__training = self.create_indexed_batcher(training_indices)
+        self.__testing = self.create_indexed_batcher(testing_indices)
+        self.__validation = self.create_indexed_batcher(validation_indices)
+
     def write_to_binary(self, file_name_and_path):
-        """Writes a processed .txt file to a .npz (binary) file.
+        """Writes the stored data to a .npz (binary) file.
+
+        The data is written once along with the sample indices of each data set, so the binary can be re-split when it is read.
+        Compact data is written as int8 codes, along with a flag so that it is read back in compact form.
+        In that case the causal SNP mask is written instead of y2.
+        The data type of the 1-hot data is also written, so that compact data is expanded to the same type when it is read back.
 
         Arguments:
             file_name_and_path: A string describing the file name (and relative path) of the .npz file to write.
@@ -64,32 +131,196 @@ class DataHolder(object):
         Returns:
             Nothing.
         """
-        training_x, training_y1, training_y2 = self.__data_loader.get_training_data()
-        testing_x, testing_y1, testing_y2 = self.__data_loader.get_testing_data()
-        validation_x, validation_y1, validation_y2 = self.__data_loader.get_validation_data()
-        headers = self.__data_loader.get_header_data()
-        np.savez(file_name_and_path,
-                 testing_x=testing_x, testing_y1=testing_y1, testing_y2=testing_y2,
-                 training_x=training_x, training_y1=training_y1, training_y2=training_y2,
-                 validation_x=validation_x, validation_y1=validation_y1, validation_y2=validation_y2,
-                 headers=headers)
-
-    def read_from_npz(self, file_name_and_path):
+        np.savez(file_name_and_path, **self.__get_binary_arrays())
+
+    def write_to_npy_dir(self, dir_name_and_path):
+        """Writes the stored data to a directory containing one uncompressed .npy file per array.
+
+        The arrays are the same as those written by write_to_binary, but they can be memory-mapped when they are read.
+
+        Arguments:
+            dir_name_and_path: A string describing the name (and relative path) of the directory to write. It is created if it does not exist.
+
+        Returns:
+            Nothing.
+        """
+        if not os.path.isdir(dir_name_and_path):
+            os.makedirs(dir_name_and_path)
+        for (name, array) in self.__get_binary_arrays().items():
+            np.save(os.path.join(dir_name_and_path, name + '.npy'), array)
+
+    def __get_binary_arrays(self):
+        """Gets the arrays which are written to a binary file.
+
+        Arguments:
+            None.
+
+        Returns:
+            A dictionary mapping each array's name to the numpy array.
+        """
+        if self.__x is None:
+            raise ValueError("The full data set is not stored. Binaries which only contain the split data sets cannot be rewritten.")
+        training_indices, validation_indices, testing_indices = self.__split_indices
+        arrays = dict(x=self.__x, y1=self.__y1,
+                      training_indices=training_indices, validation_indices=validation_indices, testing_indices=testing_indices,
+                      headers=self.__headers, compact=np.array(self.__compact), dtype=np.array(np.dtype(self.__dtype).str))
+        if self.__compact:
+            arrays['causal_mask'] = self.__causal_mask
+        else:
+            arrays['y2'] = self.__y2
+        return arrays
+
+    def read_from_npz(self, file_name_and_path, test_train_ratio=None, valid_train_ratio=0.75, stratified=False, dtype=None):
         """Reads a data set from a .npz (binary) file, storing it as four data sets: training, testing, validation and headers.
 
         Note that unlike the read_from_txt function the varios data set size ratios do not need to be set. They are stored in the binary.
+        If a test_train_ratio is given the data is re-split instead, without needing to read the .txt file again.
 
         Arguments:
             file_name_and_path: A string describing the file name (and relative path) of the .npz file to read.
+            test_train_ratio: A float describing how much of the data to use for training and how much to use for testing, or None to use the stored split.
+            valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation when re-splitting.
+            stratified: A bool describing whether each data set should keep the ratio of cases to controls of the whole data set when re-splitting.
+            dtype: The numpy data type of the 1-hot data, or None to use the type stored in the binary.
+                Converting 1-hot data to a different type makes a copy of it.
+
+        Returns:
+            Nothing.
+        """
+        self.__read_binary_arrays(np.load(file_name_and_path), dtype)
+        if test_train_ratio is not None:
+            self.split_data(test_train_ratio, valid_train_ratio, stratified)
+
+    def read_from_npy_dir(self, dir_name_and_path, memory_map=True, test_train_ratio=None, valid_train_ratio=0.75, stratified=False, dtype=None):
+        """Reads a data set from a directory of .npy files written by write_to_npy_dir.
+
+        When the arrays are memory-mapped nothing is read up front: samples are paged in from disk as batches are taken,
+        and processes on the same machine share the operating system's page cache.
+
+        Arguments:
+            dir_name_and_path: A string describing the name (and relative path) of the directory to read.
+            memory_map: A bool describing whether to memory-map the arrays (read only) rather than load them into memory.
+            test_train_ratio: A float describing how much of the data to use for training and how much to use for testing, or None to use the stored split.
+            valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation when re-splitting.
+            stratified: A bool describing whether each data set should keep the ratio of cases to controls of the whole data set when re-splitting.
+            dtype: The numpy data type of the 1-hot data, or None to use the type stored in the directory.
+                Converting memory-mapped 1-hot data to a different type reads it into memory.
+
+        Returns:
+            Nothing.
+        """
+        mmap_mode = 'r' if memory_map else None
+        arrays = {}
+        for file_name in os.listdir(dir_name_and_path):
+            if file_name.endswith('.npy'):
+                arrays[file_name[:-len('.npy')]] = np.load(os.path.join(dir_name_and_path, file_name), mmap_mode=mmap_mode)
+        if not arrays:
+            raise IOError("No .npy files were found in %s" % dir_name_and_path)
+        self.__read_binary_arrays(arrays, dtype)
+        if test_train_ratio is not None:
+            self.split_data(test_train_ratio, valid_train_ratio, stratified)
+
+    def __read_binary_arrays(self, arrays, dtype=None):
+        """Stores the data sets and headers read from a binary file.
+
+        Arguments:
+            arrays: A dictionary-like object mapping each array's name to the numpy array.
+            dtype: The numpy data type of the 1-hot data, or None to use the type stored in the binary.
 
         Returns:
             Nothing.
         """
-        npzfile = np.load(file_name_and_path)
-        self.__training = data_batcher.DataBatcher(npzfile['training_x'], npzfile['training_y1'], npzfile['training_y2'])
-        self.__testing = data_batcher.DataBatcher(npzfile['testing_x'], npzfile['testing_y1'], npzfile['testing_y2'])
-        self.__validation = data_batcher.DataBatcher(npzfile['validation_x'], npzfile['validation_y1'], npzfile['validation_y2'])
-        self.__headers = npzfile['headers']
+        # Binaries written before the compact format was added do not contain the flag and are always 1-hot
+        self.__compact = bool(arrays['compact']) if 'compact' in arrays else False
+        if dtype is not None:
+            self.__dtype = dtype
+        elif 'dtype' in arrays:
+            self.__dtype = np.dtype(str(arrays['dtype']))
+        elif self.__compact:
+            self.__dtype = data_loader.DEFAULT_DTYPE
+        else:
+            # Binaries written before the data type was stored hold 1-hot data in the type it was written with
+            self.__dtype = arrays['x'].dtype if 'x' in arrays else arrays['training_x'].dtype
+        self.__causal_mask = np.asarray(arrays['causal_mask']) if self.__compact else None
+        self.__headers = np.asarray(arrays['headers'])
+
+        if 'x' in arrays:
+            self.__x = self.__convert_1_hot(arrays['x'])
+            self.__y1 = self.__convert_1_hot(arrays['y1'])
+            # Compact binaries store the causal SNP mask rather than y2
+            self.__y2 = None if self.__compact else self.__convert_1_hot(arrays['y2'])
+            self.__labels = np.asarray(self.__y1) if self.__compact else np.argmax(self.__y1, axis=1)
+            self.__use_split(np.asarray(arrays['training_indices']), np.asarray(arrays['validation_indices']), np.asarray(arrays['testing_indices']))
+            return
+
+        # Binaries written before the split indices were stored only contain the split data sets, not the full data
+        self.__x, self.__y1, self.__y2, self.__labels, self.__split_indices = None, None, None, None, None
+        if self.__compact:
+            training_y2, testing_y2, validation_y2 = None, None, None
+        else:
+            training_y2, testing_y2, validation_y2 = [self.__convert_1_hot(arrays[name]) for name in ('training_y2', 'testing_y2', 'validation_y2')]
+        self.__training = self.__create_batcher(self.__convert_1_hot(arrays['training_x']), self.__convert_1_hot(arrays['training_y1']), training_y2)
+        self.__testing = self.__create_batcher(self.__convert_1_hot(arrays['testing_x']), self.__convert_1_hot(arrays['testing_y1']), testing_y2)
+        self.__validation = self.__create_batcher(self.__convert_1_hot(arrays['validation_x']), self.__convert_1_hot(arrays['validation_y1']), validation_y2)
+
+    def __convert_1_hot(self, array):
+        """Converts a 1-hot array read from a binary file to the data type being used. Compact arrays are returned unchanged.
+
+        Arguments:
+            array: A numpy array read from a binary file.
+
+        Returns:
+            A numpy array. It is the given array if no conversion is needed.
+        """
+        if self.__compact or array.dtype == self.__dtype:
+            return array
+        return array.astype(self.__dtype)
+
+    def __create_batcher(self, x, y1, y2):
+        """Creates a DataBatcher over one of the data sets, in compact form if the data is being stored compactly.
+
+        Arguments:
+            x: a numpy array containing the input data.
+            y1: a numpy array containing the output 1 data.
+            y2: a numpy array containing the output 2 data, or None if it is derived from y1 and the causal SNP mask.
+
+        Returns:
+            A DataBatcher object.
+        """
+        return data_batcher.DataBatcher(x, y1, y2, self.__compact, self.__causal_mask, dtype=self.__dtype,
+                                        binary_snp_labels=self.__binary_snp_labels)
+
+    def create_indexed_batcher(self, indices):
+        """Creates a DataBatcher over the stored data which batches only the samples at the given indices.
+
+        The data is not copied, so any number of DataBatchers can be created over the same storage.
+
+        Arguments:
+            indices: a numpy array of sample indices.
+
+        Returns:
+            A DataBatcher object.
+        """
+        if self.__x is None:
+            raise ValueError("The full data set is not stored. Binaries which only contain the split data sets cannot be re-split.")
+        return data_batcher.DataBatcher(self.__x, self.__y1, self.__y2, self.__compact, self.__causal_mask, indices, self.__dtype,
+                                        self.__binary_snp_labels)
+
+    def get_k_fold_data(self, num_folds, stratified=True):
+        """Splits the stored data into folds for k-fold cross validation.
+
+        Arguments:
+            num_folds: an int describing the number of folds (k).
+            stratified: a bool describing whether every fold should have the same ratio of cases to controls as the whole data set.
+
+        Returns:
+            A list containing a (training, testing) pair of DataBatcher objects for each fold.
+        """
+        if self.__labels is None:
+            raise ValueError("The full data set is not stored. Binaries which only contain the split data sets cannot be re-split.")
+        folds = data_splitter.DataSplitter(self.__labels).k_fold_split(num_folds, stratified)
+        return [(self.create_indexed_batcher(training_indices), self.create_indexed_batcher(testing_indices))
+                for (training_indices, testing_indices) in folds]
 
     def get_testing_data(self):
         """Gets the testing data being stored.
@@ -124,6 +355,28 @@ class DataHolder(object):
         """
         return self.__validation
 
+    def is_compact(self):
+        """Gets whether the data is being stored as compact int8 codes.
+
+        Arguments:
+            None
+
+        Returns:
+            A bool which is True if the data is compact and False if it is 1-hot.
+        """
+        return self.__compact
+
+    def get_dtype(self):
+        """Gets the numpy data type of the 1-hot data.
+
+        Arguments:
+            None
+
+        Returns:
+            A numpy dtype.
+        """
+        return np.dtype(self.__dtype)
+
     def get_header_data(self):
         """Gets the header data being stored.
 
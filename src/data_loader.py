@@ -2,10 +2,122 @@
 """
 
 import math
+import os
+from itertools import islice
 from random import sample, seed, shuffle
 
 import numpy as np
 
+import data_splitter
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# The 1-hot data is produced in the type the TensorFlow placeholders expect, so it is not converted every time a batch is fed
+DEFAULT_DTYPE = np.float32
+
+def read_gametes_file(file_name_and_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Reads a GAMETES .txt file in a single streaming pass.
+
+    The header is read first and the genotype rows are then parsed chunk_size rows at a time into a preallocated int8 array.
+    Only one chunk of text is held in memory at any time.
+
+    Arguments:
+        file_name_and_path: A string describing the file name (and relative path) of the .txt file to read.
+        chunk_size: An int describing the number of rows to parse at a time.
+
+    Returns:
+        A pair containing (headers, data). headers is a list of the column names and data is an int8 numpy array with one row per sample.
+    """
+    with open(file_name_and_path, 'rb') as open_file:
+        headers = open_file.readline().decode().strip().split("\t")
+        num_cols = len(headers)
+
+        # Every value takes up at least one digit and one separator, so the remaining file size gives an upper bound on the number of rows
+        remaining_bytes = os.path.getsize(file_name_and_path) - open_file.tell()
+        max_rows = (remaining_bytes + 1) // (2*num_cols)
+        data = np.empty((max_rows, num_cols), dtype=np.int8)
+
+        num_rows = 0
+        # The header is line 1, so the first genotype row is line 2
+        line_number = 2
+        while True:
+            lines = list(islice(open_file, chunk_size))
+            if not lines:
+                break
+            # Every row is checked on its own, as ragged rows can still add up to a whole number of rows in a chunk.
+            # Counting the tabs is much cheaper than splitting each row, and only the rows with the wrong count are looked at again
+            suspect_rows = np.flatnonzero(np.array([line.count(b'\t') for line in lines]) != num_cols - 1)
+            blank_rows = [i for i in suspect_rows if not lines[i].strip()]
+            ragged_rows = [i for i in suspect_rows if lines[i].strip()]
+            if ragged_rows:
+                raise ValueError("Line %i of %s contains %i values but the header has %i columns"
+                                 %(line_number + ragged_rows[0], file_name_and_path, len(lines[ragged_rows[0]].split()), num_cols))
+            line_number += len(lines)
+            num_lines = len(lines) - len(blank_rows)
+            if not num_lines:
+                continue
+            values = np.fromstring(b''.join(lines).strip(), dtype=np.int8, sep=' ')
+            if values.size != num_lines*num_cols:
+                raise ValueError("Lines %i to %i of %s contain values which are not genotype codes"
+                                 %(line_number - len(lines), line_number - 1, file_name_and_path))
+            values = values.reshape(num_lines, num_cols)
+            data[num_rows:num_rows + values.shape[0]] = values
+            num_rows += values.shape[0]
+
+    # Release the unused part of the allocation if the upper bound was not tight
+    if num_rows < max_rows:
+        data = data[:num_rows].copy()
+
+    return headers, data
+
+def genotypes_to_1_hot(x, dtype=DEFAULT_DTYPE):
+    """Converts genotype codes to a 1-hot encoding indicating whether each SNP is double major, major-minor, or double minor.
+
+    Arguments:
+        x: A numpy array of genotype codes (0, 1, or 2).
+        dtype: The numpy data type of the 1-hot array.
+
+    Returns:
+        A numpy array of the given type with the shape of x plus a trailing dimension of size 3.
+    """
+    return (x[..., np.newaxis] == np.arange(3)).astype(dtype)
+
+def labels_to_1_hot(y1, dtype=DEFAULT_DTYPE):
+    """Converts case/control labels to a 1-hot encoding where index 0 is control and index 1 is case.
+
+    Arguments:
+        y1: A numpy array of labels (0 for control and 1 for case).
+        dtype: The numpy data type of the 1-hot array.
+
+    Returns:
+        A numpy array of the given type with the shape of y1 plus a trailing dimension of size 2.
+    """
+    return (y1[..., np.newaxis] == np.arange(2)).astype(dtype)
+
+def snp_labels_to_1_hot(y2, dtype=DEFAULT_DTYPE):
+    """Converts causal SNP labels to a 1-hot encoding where index 0 is causing epistasis and index 1 is not.
+
+    Arguments:
+        y2: A numpy array of SNP labels (1 for causing epistasis and 0 otherwise).
+        dtype: The numpy data type of the 1-hot array.
+
+    Returns:
+        A numpy array of the given type with the shape of y2 plus a trailing dimension of size 2.
+    """
+    return (y2[..., np.newaxis] == np.array([1, 0])).astype(dtype)
+
+def snp_labels_to_binary(y2, dtype=DEFAULT_DTYPE):
+    """Converts causal SNP labels to a single state per SNP, the 'causing epi' state (index 0) of snp_labels_to_1_hot.
+
+    Arguments:
+        y2: A numpy array of SNP labels (1 for causing epistasis and 0 otherwise).
+        dtype: The numpy data type of the array.
+
+    Returns:
+        A numpy array of the given type with the shape of y2 plus a trailing dimension of size 1.
+    """
+    return (y2[..., np.newaxis] == 1).astype(dtype)
+
 
 class DataLoader(object):
     """A class which loads data from .txt files.
@@ -13,7 +125,7 @@ class DataLoader(object):
     It also formats data into 1-hot and splits data into training, testing, and validation sets.
     """
 
-    def __init__(self, file_name_and_path, test_train_ratio, valid_train_ratio):
+    def __init__(self, file_name_and_path, test_train_ratio, valid_train_ratio, chunk_size=DEFAULT_CHUNK_SIZE, dtype=DEFAULT_DTYPE):
         """Creates a DataLoader
 
         It reads from the given file and splits the data into x, y1 and y2.
@@ -26,16 +138,19 @@ class DataLoader(object):
             file_name_and_path: A string describing the file name (and relative path) of the .txt file to read.
             test_train_ratio: A float describing how much of the data to use for training and how much to use for testing.
             valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation.
+            chunk_size: An int describing the number of rows of the .txt file to parse at a time.
+            dtype: The numpy data type of the 1-hot data, for example np.float32 or np.uint8.
 
         Returns:
             A DataLoader object.
         """
         self.__path = file_name_and_path
+        self.__dtype = dtype
         self.__test_train_ratio = test_train_ratio
         self.__valid_train_ratio = valid_train_ratio
 
-        # Read the data file, and get the numer of rows and collumns
-        data = np.genfromtxt(file_name_and_path, dtype='intc', skip_header=1)
+        # Read the header and data file in one pass, and get the numer of rows and collumns
+        self.__headers, data = read_gametes_file(file_name_and_path, chunk_size)
         self.__num_samples, num_rows = data.shape
         self.__num_loci = num_rows - 1
 
@@ -43,31 +158,16 @@ class DataLoader(object):
         self.__x = data[:, 0:(self.__num_loci)]
         self.__y_1 = data[:, self.__num_loci]
 
-        # Generate the secondary output
-        with open(file_name_and_path, 'r') as open_file:
-            header = open_file.readline().strip()
-            self.__headers = header.split("\t")
-            self.__y_2 = np.zeros(self.__x.shape)
-            for (i, row) in enumerate(self.__y_2):
-                for (j, _) in enumerate(row):
-                    if self.__y_1[i] == 1 and self.__headers[j][0] == 'M':
-                        self.__y_2[i][j] = 1
+        # The secondary output is not stored, it is derived from y1 and the SNPs which the header marks as causal ('M')
+        self.__causal_mask = np.array([header.startswith('M') for header in self.__headers[:self.__num_loci]], dtype=bool)
 
         self.__x_1_hot = None
         self.__y_1_hot_1 = None
         self.__y_1_hot_2 = None
 
-        self.__training_x = None
-        self.__training_y_1 = None
-        self.__training_y_2 = None
-
-        self.__testing_x = None
-        self.__testing_y_1 = None
-        self.__testing_y_2 = None
-
-        self.__validation_x = None
-        self.__validation_y_1 = None
-        self.__validation_y_2 = None
+        self.__training_indices = None
+        self.__testing_indices = None
+        self.__validation_indices = None
 
 
     def convert_data_to_1_hot(self):
@@ -81,105 +181,141 @@ class DataLoader(object):
         """
         # We want the data to be in a 1-hot format indicating whether the SNP is
         # double major, major-minor, or double minor
-        # To do this we iterate through the data and for each element, we create a new 1-hot array
-        self.__x_1_hot = np.zeros((self.__num_samples, self.__num_loci, 3))
-        for (i, row) in enumerate(self.__x):
-            for (j, cell) in enumerate(row):
-                self.__x_1_hot[i][j][0] = int(cell == 0)
-                self.__x_1_hot[i][j][1] = int(cell == 1)
-                self.__x_1_hot[i][j][2] = int(cell == 2)
+        self.__x_1_hot = genotypes_to_1_hot(self.__x, self.__dtype)
 
         # Labels need to also be 1-hot with index 0 is control and index 1 is case
-        self.__y_1_hot_1 = np.zeros((self.__num_samples, 2))
-        for (i, cell) in enumerate(self.__y_1):
-            self.__y_1_hot_1[i][0] = int(cell == 0)
-            self.__y_1_hot_1[i][1] = int(cell == 1)
+        self.__y_1_hot_1 = labels_to_1_hot(self.__y_1, self.__dtype)
 
         # Make the secondary output also 1 hot
-        self.__y_1_hot_2 = np.zeros([self.__y_2.shape[0], self.__y_2.shape[1], 2])
-        for (i, row) in enumerate(self.__y_2):
-            for (j, cell) in enumerate(row):
-                self.__y_1_hot_2[i][j][0] = int(cell == 1)
-                self.__y_1_hot_2[i][j][1] = int(cell == 0)
+        self.__y_1_hot_2 = snp_labels_to_1_hot(self.__derive_y_2(), self.__dtype)
 
-    def split_data(self):
+    def split_data(self, legacy_split=False, stratified=False):
         """Splits the data set into three smaller data sets for training, testing and validation.
 
+        Only the sample indices of each data set are stored. The data sets themselves are gathered from the full data when they are requested.
+
         Arguments:
-            Nothing.
+            legacy_split: A bool describing whether to reproduce the exact split made by earlier versions, which sampled the indices with the random module.
+            stratified: A bool describing whether each data set should keep the ratio of cases to controls of the whole data set. It is ignored for a legacy split.
 
         Returns:
             Nothing.
         """
-        seed(42)
         # We now want to split the data into training, validation and testing sets
+        if legacy_split:
+            num_not_testing = int(math.ceil(self.__test_train_ratio*self.__num_samples))
+            num_training = int(math.ceil(self.__valid_train_ratio*num_not_testing))
+            split_indices = self.__legacy_split_indices(num_not_testing, num_training)
+        elif stratified:
+            split_indices = data_splitter.DataSplitter(self.__y_1).stratified_split(self.__test_train_ratio, self.__valid_train_ratio)
+        else:
+            split_indices = data_splitter.DataSplitter(self.__y_1).random_split(self.__test_train_ratio, self.__valid_train_ratio)
+        self.__training_indices, self.__validation_indices, self.__testing_indices = [np.asarray(indices, dtype=np.intp) for indices in split_indices]
+
+        # Because we are sampling randomly, for large data sets,
+        # the ratio of case and controls in the data should remain 50% in both sets
+        print("The number of training samples is %i with %i cases (%d percent)"
+              %(len(self.__training_indices), np.sum(self.__y_1[self.__training_indices]), np.mean(self.__y_1[self.__training_indices])*100))
+        if len(self.__testing_indices) > 0:
+            print("The number of testing samples is %i with %i cases (%d percent)"
+                  %(len(self.__testing_indices), np.sum(self.__y_1[self.__testing_indices]), np.mean(self.__y_1[self.__testing_indices])*100))
+        if len(self.__validation_indices) > 0:
+            print("The number of validation samples is %i with %i cases (%d percent)"
+                  %(len(self.__validation_indices), np.sum(self.__y_1[self.__validation_indices]), np.mean(self.__y_1[self.__validation_indices])*100))
+
+    def __legacy_split_indices(self, num_not_testing, num_training):
+        """Reproduces the training, validation and testing indices chosen by earlier versions of split_data.
+
+        Set lookups are used in place of list membership tests so that this runs in linear time, but the resulting order is unchanged.
+
+        Arguments:
+            num_not_testing: An int describing the number of samples to use for training and validation.
+            num_training: An int describing the number of samples to use for training.
+
+        Returns:
+            A triple containing (training_indices, validation_indices, testing_indices). Each element is a list.
+        """
+        seed(42)
         # We randomly choose a number of training/validation indices
-        not_testing_indices = sample(range(self.__num_samples),
-                                     int(math.ceil(self.__test_train_ratio*self.__num_samples)))
+        not_testing_indices = sample(range(self.__num_samples), num_not_testing)
         # Now split those indices into training and validation
-        training_indices = sample(not_testing_indices,
-                                  int(math.ceil(self.__valid_train_ratio*len(not_testing_indices))))
-        shuffle(training_indices) # does this actually do anything?
-        self.__training_x = self.__x_1_hot[training_indices]
-        self.__training_y_1 = self.__y_1_hot_1[training_indices]
-        self.__training_y_2 = self.__y_1_hot_2[training_indices]
-
-        validation_indices = [elem for elem in not_testing_indices if elem not in training_indices]
+        training_indices = sample(not_testing_indices, num_training)
+        shuffle(training_indices)
+
+        training_set = set(training_indices)
+        validation_indices = [elem for elem in not_testing_indices if elem not in training_set]
         shuffle(validation_indices)
-        self.__validation_x = self.__x_1_hot[validation_indices]
-        self.__validation_y_1 = self.__y_1_hot_1[validation_indices]
-        self.__validation_y_2 = self.__y_1_hot_2[validation_indices]
 
         # All of the other indices are to become the testing set
-        testing_indices = [elem for elem in range(self.__num_samples) if elem not in not_testing_indices]
+        not_testing_set = set(not_testing_indices)
+        testing_indices = [elem for elem in range(self.__num_samples) if elem not in not_testing_set]
         shuffle(testing_indices)
-        self.__testing_x = self.__x_1_hot[testing_indices]
-        self.__testing_y_1 = self.__y_1_hot_1[testing_indices]
-        self.__testing_y_2 = self.__y_1_hot_2[testing_indices]
 
-        # Because we are sampling randomly, for large data sets,
-        # the ratio of case and controls in the data should remain 50% in both sets
-        print("The number of training samples is %i with %i cases (%d percent)"
-              %(len(self.__training_y_1), sum(self.__training_y_1[:, 1]), np.mean(self.__training_y_1[:, 1])*100))
-        if testing_indices:
-            print("The number of testing samples is %i with %i cases (%d percent)"
-                  %(len(self.__testing_y_1), sum(self.__testing_y_1[:, 1]), np.mean(self.__testing_y_1[:, 1])*100))
-        if validation_indices:
-            print("The number of validation samples is %i with %i cases (%d percent)"
-                  %(len(self.__validation_y_1), sum(self.__validation_y_1[:, 1]), np.mean(self.__validation_y_1[:, 1])*100))
+        return training_indices, validation_indices, testing_indices
 
     def get_testing_data(self):
         """Returns a protion of the 1-hot data to be used for testing. This portion is based on the test-train ratio that the DataLoader was initialised with.
 
+        If the data has not been converted to a 1-hot encoding the compact genotype codes and labels are returned instead, with y2 as None.
+
         Arguments:
             Nothing.
 
         Returns:
             A triple containing (x, y1, y2). Each element is a numpy array.
         """
-        return (self.__testing_x, self.__testing_y_1, self.__testing_y_2)
+        return self.__gather(self.__testing_indices)
 
     def get_training_data(self):
         """Returns a protion of the 1-hot data to be used for training. This portion is based on the test-train ratio that the DataLoader was initialised with.
 
+        If the data has not been converted to a 1-hot encoding the compact genotype codes and labels are returned instead, with y2 as None.
+
         Arguments:
             Nothing.
 
         Returns:
             A triple containing (x, y1, y2). Each element is a numpy array.
         """
-        return (self.__training_x, self.__training_y_1, self.__training_y_2)
+        return self.__gather(self.__training_indices)
 
     def get_validation_data(self):
         """Returns a protion of the 1-hot data to be used for validation. This portion is based on the test-train ratio that the DataLoader was initialised with.
 
+        If the data has not been converted to a 1-hot encoding the compact genotype codes and labels are returned instead, with y2 as None.
+
         Arguments:
             Nothing.
 
         Returns:
             A triple containing (x, y1, y2). Each element is a numpy array.
         """
-        return (self.__validation_x, self.__validation_y_1, self.__validation_y_2)
+        return self.__gather(self.__validation_indices)
+
+    def get_split_indices(self):
+        """Returns the sample indices of each data set chosen by split_data.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A triple containing (training, validation, testing) indices. Each element is a numpy array.
+        """
+        return (self.__training_indices, self.__validation_indices, self.__testing_indices)
+
+    def __gather(self, indices):
+        """Gathers the samples at the given indices from the 1-hot data, or from the compact data if it has not been converted.
+
+        Arguments:
+            indices: A numpy array of sample indices.
+
+        Returns:
+            A triple containing (x, y1, y2). Each element is a numpy array, except y2 which is None for compact data.
+        """
+        if self.__x_1_hot is not None:
+            return (self.__x_1_hot[indices], self.__y_1_hot_1[indices], self.__y_1_hot_2[indices])
+        # y2 is not gathered for compact data as it can be derived from y1 and the causal SNP mask
+        return (self.__x[indices], self.__y_1[indices], None)
 
     def get_1_hot_data(self):
         """Returns all of the 1-hot encoded data.
@@ -200,7 +336,40 @@ class DataLoader(object):
         Returns:
             A triple containing (x, y1, y2). Each element is a numpy array.
         """
-        return (self.__x, self.__y_1, self.__y_2)
+        return (self.__x, self.__y_1, self.__derive_y_2())
+
+    def get_compact_data(self):
+        """Returns the compact genotype codes and case/control labels without deriving y2.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A pair containing (x, y1). Each element is a numpy array.
+        """
+        return (self.__x, self.__y_1)
+
+    def __derive_y_2(self):
+        """Derives the secondary output: a SNP causes epistasis in a sample if the sample is a case and the SNP is causal.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int8 numpy array with one row per sample and one column per SNP.
+        """
+        return np.outer(self.__y_1 == 1, self.__causal_mask).astype(np.int8)
+
+    def get_causal_mask(self):
+        """Returns the mask of SNPs which are marked as causing epistasis in the header.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A boolean numpy array with one entry per SNP.
+        """
+        return self.__causal_mask
 
     def get_header_data(self):
         """Returns the header data.
@@ -0,0 +1,106 @@
+"""This module provides a single class: DataSplitter, which chooses the sample indices of the training, validation and testing sets.
+"""
+
+import math
+
+import numpy as np
+
+
+class DataSplitter(object):
+    """A class which splits a data set into index arrays.
+
+    It supports random and stratified training/validation/testing splits as well as (stratified) k-fold cross validation.
+    Only index arrays are returned so that the data itself never needs to be copied for each split or fold.
+    """
+
+    def __init__(self, labels, random_seed=42):
+        """Creates a DataSplitter.
+
+        Arguments:
+            labels: a numpy array containing the case/control label of each sample. It is used for stratification.
+            random_seed: an int used to seed the permutations so that the splits are reproducable.
+
+        Returns:
+            A DataSplitter object.
+        """
+        self.__labels = np.asarray(labels)
+        self.__num_samples = self.__labels.shape[0]
+        self.__random_seed = random_seed
+
+    def random_split(self, test_train_ratio, valid_train_ratio):
+        """Splits the samples by cutting a single seeded permutation into three ranges.
+
+        Arguments:
+            test_train_ratio: A float describing how much of the data to use for training and how much to use for testing.
+            valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation.
+
+        Returns:
+            A triple containing (training, validation, testing) indices. Each element is a numpy array.
+        """
+        permutation = np.random.RandomState(self.__random_seed).permutation(self.__num_samples)
+        return self.__cut(permutation, test_train_ratio, valid_train_ratio)
+
+    def stratified_split(self, test_train_ratio, valid_train_ratio):
+        """Splits the samples so that each set has the same ratio of cases to controls as the whole data set.
+
+        Every class is permuted and cut into three ranges separately, then the classes are shuffled together within each set.
+
+        Arguments:
+            test_train_ratio: A float describing how much of the data to use for training and how much to use for testing.
+            valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation.
+
+        Returns:
+            A triple containing (training, validation, testing) indices. Each element is a numpy array.
+        """
+        random_state = np.random.RandomState(self.__random_seed)
+        splits = ([], [], [])
+        for label in np.unique(self.__labels):
+            members = np.flatnonzero(self.__labels == label)
+            for (split, indices) in zip(splits, self.__cut(random_state.permutation(members), test_train_ratio, valid_train_ratio)):
+                split.append(indices)
+        return tuple(random_state.permutation(np.concatenate(split)) for split in splits)
+
+    def k_fold_split(self, num_folds, stratified=True):
+        """Splits the samples into folds for k-fold cross validation.
+
+        Arguments:
+            num_folds: an int describing the number of folds (k). It must be between 2 and the number of samples.
+            stratified: a bool describing whether every fold should have the same ratio of cases to controls as the whole data set.
+
+        Returns:
+            A list containing a (training, testing) pair of index arrays for each fold.
+        """
+        if num_folds < 2 or num_folds > self.__num_samples:
+            raise ValueError("The number of folds must be between 2 and the number of samples (%i)" % self.__num_samples)
+
+        random_state = np.random.RandomState(self.__random_seed)
+        if stratified:
+            # Grouping the permuted samples by class and dealing them out in turn spreads every class evenly across the folds
+            order = np.concatenate([random_state.permutation(np.flatnonzero(self.__labels == label)) for label in np.unique(self.__labels)])
+        else:
+            order = random_state.permutation(self.__num_samples)
+        fold_of_sample = np.empty(self.__num_samples, dtype=np.intp)
+        fold_of_sample[order] = np.arange(self.__num_samples) % num_folds
+
+        folds = []
+        for fold in range(num_folds):
+            testing_indices = random_state.permutation(np.flatnonzero(fold_of_sample == fold))
+            training_indices = random_state.permutation(np.flatnonzero(fold_of_sample != fold))
+            folds.append((training_indices, testing_indices))
+        return folds
+
+    @staticmethod
+    def __cut(permutation, test_train_ratio, valid_train_ratio):
+        """Cuts a permutation of sample indices into training, validation and testing ranges.
+
+        Arguments:
+            permutation: a numpy array of sample indices in a random order.
+            test_train_ratio: A float describing how much of the data to use for training and how much to use for testing.
+            valid_train_ratio: A float describing how much of the training data to use for actual training and how much to use for validation.
+
+        Returns:
+            A triple containing (training, validation, testing) indices. Each element is a numpy array.
+        """
+        num_not_testing = int(math.ceil(test_train_ratio*len(permutation)))
+        num_training = int(math.ceil(valid_train_ratio*num_not_testing))
+        return (permutation[:num_training], permutation[num_training:num_not_testing], permutation[num_not_testing:])
@@ -0,0 +1,170 @@
+"""This module provides a single class: EvaluationScheduler, which decides when to evaluate a model and can evaluate it on a background thread.
+"""
+
+import threading
+
+import tensorflow as tf
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class EvaluationScheduler(object):
+    """A class which schedules evaluations of a model.
+
+    The evaluation data is given once as a feed_dict and cached, so it is not batched and expanded again for every evaluation.
+
+    In asynchronous mode the values of the variables are copied when an evaluation is requested, and the evaluation runs on a
+    background thread with those values fed in place of the variables. Training can therefore carry on changing the variables
+    while the evaluation runs, and the results still describe the model as it was at the requested step.
+    If an evaluation is requested while the previous one is still running it is skipped rather than queued.
+    """
+
+    def __init__(self, sess, fetches, feed_dict, interval=10, asynchronous=False, variables=None):
+        """Creates an EvaluationScheduler. In asynchronous mode its background thread is started.
+
+        Arguments:
+            sess: the TensorFlow session to evaluate in.
+            fetches: a list of the tensors to evaluate, for example the merged summary, the accuracies and the losses.
+            feed_dict: a dictionary mapping the input tensors to the evaluation data (and keep_prob to 1.0).
+            interval: an int describing how many steps apart evaluations are due.
+            asynchronous: a bool describing whether to evaluate on a background thread.
+            variables: a list of the variables to copy for an asynchronous evaluation. If it is None the trainable variables are copied.
+
+        Returns:
+            An EvaluationScheduler object.
+        """
+        if interval < 1:
+            raise ValueError("The evaluation interval must be at least 1 step")
+        self.__sess = sess
+        self.__fetches = fetches
+        self.__feed_dict = dict(feed_dict)
+        self.__interval = interval
+        self.__asynchronous = asynchronous
+        self.__variables = tf.trainable_variables() if variables is None else variables
+
+        self.__results = []
+        self.__results_lock = threading.Lock()
+        self.__error = None
+        self.__num_skipped = 0
+
+        self.__thread = None
+        if asynchronous:
+            self.__requests = queue.Queue(maxsize=1)
+            self.__idle = threading.Event()
+            self.__idle.set()
+            self.__thread = threading.Thread(target=self.__run_requests, name='evaluation_scheduler')
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def is_due(self, step):
+        """Returns whether an evaluation is due at a training step.
+
+        Arguments:
+            step: an int describing the training step.
+
+        Returns:
+            A bool which is True if an evaluation should be requested.
+        """
+        return step % self.__interval == 0
+
+    def evaluate(self, step):
+        """Requests an evaluation of the model as it is at a training step. The results are returned by get_results.
+
+        Arguments:
+            step: an int describing the training step.
+
+        Returns:
+            Nothing.
+        """
+        if not self.__asynchronous:
+            self.__add_result(step, self.__sess.run(self.__fetches, feed_dict=self.__feed_dict), None)
+            return
+
+        if not self.__idle.is_set():
+            self.__num_skipped += 1
+            return
+        self.__idle.clear()
+        snapshot = self.__sess.run(self.__variables)
+        feed_dict = dict(self.__feed_dict)
+        feed_dict.update(zip(self.__variables, snapshot))
+        self.__requests.put((step, feed_dict, snapshot))
+
+    def __run_requests(self):
+        """Runs the requested evaluations until a None request is received.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        while True:
+            request = self.__requests.get()
+            if request is None:
+                return
+            (step, feed_dict, snapshot) = request
+            try:
+                self.__add_result(step, self.__sess.run(self.__fetches, feed_dict=feed_dict), snapshot)
+            except Exception as excep:
+                self.__error = excep
+            self.__idle.set()
+
+    def __add_result(self, step, result, snapshot):
+        """Stores the results of an evaluation until they are collected.
+
+        Arguments:
+            step: an int describing the training step which was evaluated.
+            result: a list containing the evaluated value of each of the fetches.
+            snapshot: a list containing the value of each of the copied variables, or None if the variables were not copied.
+
+        Returns:
+            Nothing.
+        """
+        with self.__results_lock:
+            self.__results.append((step, result, snapshot))
+
+    def get_results(self):
+        """Returns the results of the evaluations which have finished since the last call, raising any error from the background thread.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A list containing a (step, results, snapshot) triple for each finished evaluation, in step order. The snapshot is the list of
+            variable values which were evaluated in asynchronous mode, so that they can be checkpointed, and None in synchronous mode.
+        """
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+        with self.__results_lock:
+            results, self.__results = self.__results, []
+        return results
+
+    def get_num_skipped(self):
+        """Returns the number of evaluations which were skipped because the previous one was still running.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int number of evaluations.
+        """
+        return self.__num_skipped
+
+    def stop(self):
+        """Waits for any running evaluation to finish and stops the background thread.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        if self.__thread is None:
+            return
+        self.__requests.put(None)
+        self.__thread.join()
+        self.__thread = None
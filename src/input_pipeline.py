@@ -0,0 +1,119 @@
+"""This module provides a single class: InputPipeline, which feeds batches from a DataBatcher to a TensorFlow graph through a queue.
+"""
+
+import threading
+
+import tensorflow as tf
+
+
+class InputPipeline(object):
+    """A class which feeds a graph through a TensorFlow queue.
+
+    Reader threads take batches from a DataBatcher and enqueue them into a tf.FIFOQueue, so the copy of each batch into TensorFlow
+    happens while the previous training steps run rather than on every sess.run. The graph reads its inputs by dequeuing a batch.
+
+    The input tensors are created with tf.placeholder_with_default, so a batch can still be given in a feed_dict, for example
+    to evaluate the testing data, in which case nothing is dequeued.
+    """
+
+    def __init__(self, batcher, batch_size, num_threads=2, capacity=8, dtype=tf.float32):
+        """Creates an InputPipeline. The reader threads are not started until start is called.
+
+        Arguments:
+            batcher: the DataBatcher to take batches from. It should not be used by anything else while the reader threads are running.
+            batch_size: an int describing the number of samples to include in each batch.
+            num_threads: an int describing the number of reader threads to enqueue batches with.
+            capacity: an int describing the maximum number of batches worth of samples to hold in the queue.
+            dtype: the TensorFlow data type of the inputs and outputs.
+
+        Returns:
+            An InputPipeline object.
+        """
+        if num_threads < 1:
+            raise ValueError("At least one reader thread is required")
+        self.__batcher = batcher
+        self.__batch_size = batch_size
+        self.__num_threads = num_threads
+        # DataBatchers are not thread safe, so only one reader takes a batch at a time while the others enqueue theirs
+        self.__batcher_lock = threading.Lock()
+        self.__coordinator = None
+        self.__threads = []
+
+        # Every dimension apart from the number of samples is fixed by the data
+        shapes = [[None] + list(shape[1:]) for shape in (batcher.get_input_shape(), batcher.get_output1_shape(), batcher.get_output2_shape())]
+
+        with tf.name_scope('input_queue'):
+            self.__placeholders = [tf.placeholder(dtype, shape) for shape in shapes]
+            self.__queue = tf.FIFOQueue(capacity*batch_size, [dtype]*3, shapes=[shape[1:] for shape in shapes])
+            self.__enqueue = self.__queue.enqueue_many(self.__placeholders)
+            self.__close = self.__queue.close(cancel_pending_enqueues=True)
+            dequeued = self.__queue.dequeue_many(batch_size)
+            tf.scalar_summary('input_queue/fraction_full', tf.cast(self.__queue.size(), tf.float32)*(1.0/(capacity*batch_size)))
+
+        with tf.name_scope('input'):
+            self.__inputs = (tf.placeholder_with_default(dequeued[0], shapes[0], name='x-input'),
+                             tf.placeholder_with_default(dequeued[1], shapes[1], name='y-input1'),
+                             tf.placeholder_with_default(dequeued[2], shapes[2], name='y-input2'))
+
+    def get_inputs(self):
+        """Returns the tensors which the graph should read its inputs and outputs from.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A triple containing (x, y1, y2). Each element is a tensor which can also be fed.
+        """
+        return self.__inputs
+
+    def start(self, sess):
+        """Starts the reader threads.
+
+        Arguments:
+            sess: the TensorFlow session to run the enqueue operations in.
+
+        Returns:
+            Nothing.
+        """
+        self.__coordinator = tf.train.Coordinator()
+        self.__threads = [threading.Thread(target=self.__read, args=(sess,), name='input_pipeline_%i' % i) for i in range(self.__num_threads)]
+        for thread in self.__threads:
+            thread.daemon = True
+            thread.start()
+
+    def __read(self, sess):
+        """Takes batches from the DataBatcher and enqueues them until the InputPipeline is stopped.
+
+        Any exception other than the queue being closed is passed to the coordinator, so that it is raised again by stop.
+
+        Arguments:
+            sess: the TensorFlow session to run the enqueue operations in.
+
+        Returns:
+            Nothing.
+        """
+        with self.__coordinator.stop_on_exception():
+            while not self.__coordinator.should_stop():
+                with self.__batcher_lock:
+                    batch = self.__batcher.next_batch(self.__batch_size)
+                try:
+                    sess.run(self.__enqueue, feed_dict=dict(zip(self.__placeholders, batch)))
+                except (tf.errors.CancelledError, tf.errors.AbortedError):
+                    # The queue has been closed by stop
+                    return
+
+    def stop(self, sess):
+        """Stops the reader threads and closes the queue. After this the inputs must be fed.
+
+        Arguments:
+            sess: the TensorFlow session which the reader threads were started with.
+
+        Returns:
+            Nothing.
+        """
+        if self.__coordinator is None:
+            return
+        self.__coordinator.request_stop()
+        sess.run(self.__close)
+        self.__coordinator.join(self.__threads)
+        self.__coordinator = None
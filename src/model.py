@@ -25,6 +25,8 @@ class Model(object):
         self._keep_prob = None
         self._epi_snps = None
         self._count = None
+        self._snp_scores = None
+        self._snp_counts = None
 
     def get_accuracies(self):
         """Returns sessions to run in order to get the accuracies for each of the outputs.
@@ -48,6 +50,28 @@ class Model(object):
         """
         return self._epi_snps, self._count
 
+    def get_snp_scores(self):
+        """Returns sessions to run in order to get the fixed size per snp scores of a batch, which can be accumulated by a SnpScorer.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            (probability_sums, counts) - TensorFlow sessions which return the summed 'causing epi' probability and the number of predictions of each snp.
+        """
+        return self._snp_scores
+
+    def get_snp_counts(self):
+        """Returns sessions to run in order to get the fixed size snp prediction counts of a batch, which can be summed over batches.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            (true_positives, false_positives, false_negatives) - TensorFlow sessions which count the snp predictions of each kind.
+        """
+        return self._snp_counts
+
     def get_losses(self):
         """Returns sessions to run in order to get the lesses for each of the outputs.
 
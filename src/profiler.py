@@ -0,0 +1,177 @@
+"""This module provides a single class: Profiler, which traces sampled steps and aggregates their cost per named scope.
+"""
+
+import os
+
+import tensorflow as tf
+from tensorflow.python.client import timeline
+
+
+class Profiler(object):
+    """A class which profiles sampled steps of a TensorFlow graph.
+
+    Full tracing slows down the steps it is used on, so only every trace_every-th step is traced and profiling is off by default.
+    The compute time and memory of every traced operation is added to the total of its top level name scope (for example conv_1
+    or hidden_1), giving one summary across all of the traced steps.
+    If an output directory is given, a Chrome trace of each traced step and the summary are also written to it.
+    """
+
+    def __init__(self, trace_every=0, output_dir=None):
+        """Creates a Profiler.
+
+        Arguments:
+            trace_every: an int describing how many steps apart traced steps are. 0 turns tracing off.
+            output_dir: a string describing the directory to write the Chrome traces and summary to, or None to not write any files.
+
+        Returns:
+            A Profiler object.
+        """
+        self.__trace_every = trace_every
+        self.__output_dir = output_dir
+        self.__scopes = {}
+        self.__num_traced = 0
+
+    def is_enabled(self):
+        """Returns whether any steps will be traced.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A bool which is True if tracing is on.
+        """
+        return self.__trace_every > 0
+
+    def is_traced(self, step):
+        """Returns whether a training step should be traced.
+
+        Arguments:
+            step: an int describing the training step.
+
+        Returns:
+            A bool which is True if the step should be traced.
+        """
+        return self.is_enabled() and step % self.__trace_every == self.__trace_every - 1
+
+    def get_run_args(self, step):
+        """Returns the extra arguments to sess.run for a step: the full trace options and metadata if the step is traced.
+
+        Arguments:
+            step: an int describing the training step.
+
+        Returns:
+            A dictionary of keyword arguments for sess.run. It is empty if the step is not traced.
+        """
+        if not self.is_traced(step):
+            return {}
+        return self.get_trace_args()
+
+    @staticmethod
+    def get_trace_args():
+        """Returns the extra arguments to sess.run which fully trace it.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A dictionary containing the full trace 'options' and the 'run_metadata' to fill in.
+        """
+        return {'options': tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE), 'run_metadata': tf.RunMetadata()}
+
+    def record(self, name, run_metadata):
+        """Adds the cost of a traced step to the per scope totals, and writes its Chrome trace if there is an output directory.
+
+        Arguments:
+            name: a string naming the traced step, for example 'step099'. It is used for the name of the trace file.
+            run_metadata: the tf.RunMetadata filled in by the traced sess.run.
+
+        Returns:
+            Nothing.
+        """
+        self.add_step_stats(run_metadata.step_stats)
+        if self.__output_dir:
+            chrome_trace = timeline.Timeline(run_metadata.step_stats).generate_chrome_trace_format(show_memory=True)
+            self.__write('timeline_%s.json' % name, chrome_trace)
+
+    def add_step_stats(self, step_stats):
+        """Adds the compute time and memory of every operation in a traced step to the total of its top level name scope.
+
+        Arguments:
+            step_stats: the StepStats of a traced step.
+
+        Returns:
+            Nothing.
+        """
+        self.__num_traced += 1
+        for device_stats in step_stats.dev_stats:
+            for node_stats in device_stats.node_stats:
+                scope = node_stats.node_name.split('/')[0]
+                totals = self.__scopes.setdefault(scope, {'time': 0, 'memory': 0, 'ops': 0})
+                totals['time'] += node_stats.all_end_rel_micros
+                totals['memory'] += sum(getattr(memory, 'total_bytes', 0) for memory in node_stats.memory)
+                totals['ops'] += 1
+
+    def get_summary(self):
+        """Returns the per scope totals averaged over the traced steps, most expensive first.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A list containing a (scope, microseconds, bytes, operations) tuple per scope, averaged per traced step and sorted by time.
+        """
+        if not self.__num_traced:
+            return []
+        summary = [(scope, float(totals['time'])/self.__num_traced, float(totals['memory'])/self.__num_traced, float(totals['ops'])/self.__num_traced)
+                   for (scope, totals) in self.__scopes.items()]
+        return sorted(summary, key=lambda entry: entry[1], reverse=True)
+
+    def format_summary(self):
+        """Formats the per scope summary as a table.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A string containing one line per scope.
+        """
+        lines = ["Profile of %i traced steps (mean per step)" % self.__num_traced,
+                 "%-30s %12s %14s %8s" % ('scope', 'time (us)', 'memory (bytes)', 'ops')]
+        for (scope, time, memory, ops) in self.get_summary():
+            lines.append("%-30s %12.0f %14.0f %8.1f" % (scope, time, memory, ops))
+        return '\n'.join(lines)
+
+    def finish(self):
+        """Prints the summary, and writes it if there is an output directory.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        if not self.__num_traced:
+            return
+        summary = self.format_summary()
+        print(summary)
+        if self.__output_dir:
+            self.__write('profile_summary.txt', summary + '\n')
+
+    def __write(self, file_name, contents):
+        """Writes a file to the output directory. A failure is reported rather than raised, so that profiling can never stop training.
+
+        Arguments:
+            file_name: a string describing the name of the file within the output directory.
+            contents: a string to write to the file.
+
+        Returns:
+            Nothing.
+        """
+        try:
+            if not tf.gfile.Exists(self.__output_dir):
+                tf.gfile.MakeDirs(self.__output_dir)
+            with tf.gfile.Open(os.path.join(self.__output_dir, file_name), 'w') as output_file:
+                output_file.write(contents)
+        except (IOError, OSError, tf.errors.OpError) as excep:
+            print("Unable to write the profile to %s" % self.__output_dir)
+            print(excep)
@@ -16,7 +16,7 @@ class RecurrentModel(model.Model):
     
     """
 
-    def __init__(self, x, y1_, y2_, learning_rate):
+    def __init__(self, x, y1_, y2_, learning_rate, fused_loss=False, output_head='dense', head_rank=32):
         """Creates a RecurrentModel.
 
         Inherits from Model.
@@ -24,7 +24,10 @@ class RecurrentModel(model.Model):
         Parameters:
             x: the placeholder for the input tensor.
             y1_: the placeholder for the output 1 tensor.
-            y2_: the placeholder for the output 2 tensor.
+            y2_: the placeholder for the output 2 tensor. If it has a single state per SNP output 2 is a per SNP sigmoid rather than a softmax.
+            fused_loss: a bool describing whether to compute the losses from the logits with the fused softmax cross entropy.
+            output_head: a string describing the output 2 layer, 'dense', 'factorized' or 'local'. See utilities.snp_output_layer.
+            head_rank: an int describing the number of units the factorized output 2 layer is factorized through.
 
         Returns:
             A RecurrentModel object.
@@ -41,6 +44,8 @@ class RecurrentModel(model.Model):
         num_states_out1 = y1_.get_shape().as_list()[1]
         num_cols_out2 = y2_.get_shape().as_list()[1]
         num_states_out2 = y2_.get_shape().as_list()[2]
+        # labels with a single 'causing epi' state per snp select the per snp sigmoid head, which halves the widest layer
+        binary_snp_head = num_states_out2 == 1
 
         # parameters for the RNN
         num_neurons = 10
@@ -72,16 +77,17 @@ class RecurrentModel(model.Model):
 
         # the network splits here:
         # the first softmax layer reduces the output to a percentage chance for each of the output states
-        output1 = utilities.fc_layer(dropped, num_neurons, num_states_out1, 'softmax_1', act=tf.nn.softmax)
+        logits1 = utilities.fc_layer(dropped, num_neurons, num_states_out1, 'softmax_1', act=tf.identity)
+        output1 = tf.nn.softmax(logits1)
 
         # the second softmax layer reduces the output to a percentage chance for each SNPs output states
         with tf.name_scope('softmax_2'):
-            fc_layer = utilities.fc_layer(dropped, num_neurons, num_states_out2*num_cols_out2, layer_name='identity', act=tf.identity)
-            output2 = tf.nn.softmax(utilities.reshape(fc_layer, [-1, num_cols_out2, num_states_out2], name_suffix='3'))
+            logits2 = utilities.snp_output_layer(dropped, num_neurons, num_cols_out2, num_states_out2, layer_name='identity', head=output_head, rank=head_rank)
+            # a single state per snp is the sigmoid of its logit, otherwise the states of each snp are a softmax
+            output2 = tf.sigmoid(logits2) if binary_snp_head else tf.nn.softmax(logits2)
 
         # each of the loss layers compares the probability distributions between the correspinding outputs to get an error metric for the network's outputs
-        self._loss1 = utilities.calculate_cross_entropy(output1, y1_, name_suffix='1')
-        self._loss2 = utilities.calculate_cross_entropy(output2, y2_, name_suffix='2')
+        self._loss1, self._loss2 = utilities.select_losses(logits1, logits2, output1, output2, y1_, y2_, fused_loss, binary_snp_head)
         # these losses are compined into one for the training
         with tf.name_scope('combined_loss'):
             combined_loss = tf.add(self._loss1, self._loss2)
@@ -91,10 +97,12 @@ class RecurrentModel(model.Model):
 
         # the accuracies for each output are calculated by comparing them to the correct outputs
         self._accuracy1 = utilities.calculate_epi_accuracy(output1, y1_, name_suffix='1')
-        self._accuracy2 = utilities.calculate_snp_accuracy(output2, y2_, name_suffix='2')
+        self._accuracy2 = utilities.calculate_snp_accuracy(output2, y2_, already_split=binary_snp_head, name_suffix='2')
+        self._snp_counts = utilities.count_snp_predictions(output2, y2_, already_split=binary_snp_head)
 
         # find the top predicted snps
-        self._epi_snps, self._count = utilities.predict_snps(output2)
+        self._epi_snps, self._count = utilities.predict_snps(output2, already_split=binary_snp_head)
+        self._snp_scores = utilities.score_snps(output2, already_split=binary_snp_head)
 
         # merge all the summaries
         self._merged = tf.merge_all_summaries()
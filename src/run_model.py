@@ -2,12 +2,20 @@
 """
 from __future__ import absolute_import, division, print_function
 
+import os
 import sys
 
+import numpy as np
 import tensorflow as tf
-from tensorflow.python.client import timeline
 
+import batch_prefetcher
+import checkpoint_manager
+import chunked_inference
 import data_holder as dh
+import evaluation_scheduler
+import input_pipeline
+import profiler
+import snp_scorer
 import utilities
 
 # import the various models which can be run
@@ -24,14 +32,38 @@ APP_FLAGS.DEFINE_string('file_in', '', 'data in file location')
 APP_FLAGS.DEFINE_float('tt_ratio', 0.8, 'test:train ratio')
 APP_FLAGS.DEFINE_integer('max_steps', 1000, 'maximum steps')
 APP_FLAGS.DEFINE_integer('train_batch_size', 100, 'training batch size')
-APP_FLAGS.DEFINE_integer('test_batch_size', 1000, 'testing batch size')
+APP_FLAGS.DEFINE_integer('test_batch_size', 1000, 'number of testing samples taken once and reused by every evaluation')
 APP_FLAGS.DEFINE_string('log_dir', '/tmp/logs/runx', 'Directory for storing data')
 APP_FLAGS.DEFINE_float('learning_rate', 0.001, 'Initial learning rate')
+APP_FLAGS.DEFINE_bool('fused_loss', False, 'Compute the losses from the logits with the fused softmax cross entropy, which uses less memory.')
+APP_FLAGS.DEFINE_bool('binary_snp_head', False, 'Give output 2 a single sigmoid state per SNP rather than a 2-state softmax, halving its widest layer.')
+APP_FLAGS.DEFINE_string('output_head', 'dense', 'Layer giving the output 2 logits: dense, factorized (low rank) or local (each SNP only sees its own window of the layer before it). The last two scale linearly with the number of SNPs.')
+APP_FLAGS.DEFINE_integer('output_head_rank', 32, 'Number of units the factorized output 2 layer is factorized through.')
 APP_FLAGS.DEFINE_float('dropout', 0.5, 'Keep probability for training dropout')
 APP_FLAGS.DEFINE_string('model_dir', '/tmp/tf_models/', 'Directory for storing the saved models')
 APP_FLAGS.DEFINE_bool('write_binary', True, 'Write the processed numpy array to a binary file.')
 APP_FLAGS.DEFINE_bool('read_binary', True, 'Read a binary file rather than a text file.')
 APP_FLAGS.DEFINE_bool('save_model', True, 'Save the best model asa the training progresses.')
+APP_FLAGS.DEFINE_integer('checkpoints_to_keep', 5, 'Number of the most recent best model checkpoints to keep.')
+APP_FLAGS.DEFINE_float('checkpoint_interval', 30.0, 'Minimum number of seconds between saving checkpoints.')
+APP_FLAGS.DEFINE_string('dtype', '', 'Data type of the 1-hot data, e.g. float32, float16 or uint8. Other types than float32 are cast to float32 in the graph. If it is not set text files are read as float32 and binaries keep their stored type.')
+APP_FLAGS.DEFINE_bool('compact', True, 'Store the data as int8 codes and expand each batch to 1-hot when it is fed.')
+APP_FLAGS.DEFINE_bool('legacy_split', False, 'Reproduce the exact training/testing split made by earlier versions.')
+APP_FLAGS.DEFINE_bool('npy_dir', False, 'Write the binary as a directory of .npy files which can be memory-mapped when it is read.')
+APP_FLAGS.DEFINE_bool('resplit_binary', False, 'Re-split a binary using tt_ratio rather than using the split stored in it.')
+APP_FLAGS.DEFINE_bool('stratified', False, 'Keep the ratio of cases to controls of the whole data set in the training and testing sets.')
+APP_FLAGS.DEFINE_integer('prefetch_batches', 0, 'Number of training batches to prepare ahead on a background thread (0 disables prefetching).')
+APP_FLAGS.DEFINE_bool('shuffle', False, 'Visit the training samples in a new seeded order every epoch.')
+APP_FLAGS.DEFINE_bool('drop_last', False, 'Skip the training samples at the end of an epoch which do not fill a batch.')
+APP_FLAGS.DEFINE_integer('input_queue_threads', 0, 'Number of reader threads feeding training batches through a TensorFlow queue (0 feeds every batch with feed_dict).')
+APP_FLAGS.DEFINE_integer('input_queue_capacity', 8, 'Number of training batches the TensorFlow input queue can hold.')
+APP_FLAGS.DEFINE_integer('eval_interval', 10, 'Number of steps between evaluations on the testing data.')
+APP_FLAGS.DEFINE_bool('async_eval', False, 'Evaluate a copy of the weights on a background thread so that training is not blocked.')
+APP_FLAGS.DEFINE_integer('trace_every', 0, 'Number of steps between fully traced training steps (0 turns tracing off).')
+APP_FLAGS.DEFINE_string('trace_dir', '', 'Directory to write the Chrome trace of each traced step and the profile summary to (empty writes no files).')
+APP_FLAGS.DEFINE_integer('inference_chunk_size', 1000, 'Number of testing samples run at once in the final evaluation (0 runs the whole testing set at once).')
+APP_FLAGS.DEFINE_integer('top_snps', 0, 'Number of the most often predicted SNPs to report after training (0 reports every predicted SNP).')
+APP_FLAGS.DEFINE_string('sampler', '', 'Draw each training batch with a sampling strategy: balanced or weighted (empty batches the samples in order).')
 
 def train_model(data_holder):
     """A function that builds and trains the model.
@@ -48,22 +80,34 @@ def train_model(data_holder):
     _, num_states_out1 = data_holder.get_training_data().get_output1_shape()
     _, num_cols_out2, num_states_out2 = data_holder.get_training_data().get_output2_shape()
 
-    # Input placeholders
-    with tf.name_scope('input'):
-        x = tf.placeholder(tf.float32, [None, num_cols_in, num_states_in], name='x-input')
-        y1_ = tf.placeholder(tf.float32, [None, num_states_out1], name='y-input1')
-        y2_ = tf.placeholder(tf.float32, [None, num_cols_out2, num_states_out2], name='y-input2')
+    # Input placeholders, or tensors read from an input queue which can still be fed for evaluation.
+    # They have the same type as the data so that nothing is converted when a batch is fed.
+    data_type = tf.as_dtype(data_holder.get_dtype())
+    pipeline = None
+    if FLAGS.input_queue_threads > 0:
+        pipeline = input_pipeline.InputPipeline(data_holder.get_training_data(), FLAGS.train_batch_size,
+                                                FLAGS.input_queue_threads, FLAGS.input_queue_capacity, data_type)
+        x, y1_, y2_ = pipeline.get_inputs()
+    else:
+        with tf.name_scope('input'):
+            x = tf.placeholder(data_type, [None, num_cols_in, num_states_in], name='x-input')
+            y1_ = tf.placeholder(data_type, [None, num_states_out1], name='y-input1')
+            y2_ = tf.placeholder(data_type, [None, num_cols_out2, num_states_out2], name='y-input2')
+    feed_inputs = (x, y1_, y2_)
+    if data_type != tf.float32:
+        with tf.name_scope('input_cast'):
+            x, y1_, y2_ = [tf.cast(tensor, tf.float32) for tensor in feed_inputs]
 
     print("x Shape: %s" % x.get_shape())
     print("y1_ Shape: %s" % y1_.get_shape())
     print("y2_ Shape: %s" % y2_.get_shape())
 
-    model = scaling_model.ScalingModel(x, y1_, y2_, FLAGS.learning_rate)
+    model = scaling_model.ScalingModel(x, y1_, y2_, FLAGS.learning_rate, fused_loss=FLAGS.fused_loss,
+                                       output_head=FLAGS.output_head, head_rank=FLAGS.output_head_rank)
 
     keep_prob = model.get_keep_prob()
     loss1, loss2 = model.get_losses()
     accuracy1, accuracy2 = model.get_accuracies()
-    epi_snps, count = model.get_snp_predictions()
     merged = model.get_merged()
     train_step = model.get_train_step()
 
@@ -71,57 +115,93 @@ def train_model(data_holder):
     # Every 10th step, measure test-set accuracy, and write test summaries
     # All other steps, run train_step on training data, & add training summaries
 
+    # Optionally shuffle the training samples every epoch. Batches are gathered into reused buffers, so there must be one for each
+    # prefetched batch as well as for the batch being fed and the batch waiting to be queued, or one for each input queue reader thread.
+    if FLAGS.shuffle or FLAGS.drop_last:
+        data_holder.get_training_data().set_epoch_mode(shuffle=FLAGS.shuffle, drop_last=FLAGS.drop_last,
+                                                       num_buffers=max(FLAGS.prefetch_batches, 0) + max(FLAGS.input_queue_threads, 0) + 2)
+
+    # Optionally draw class-balanced training batches, as the cases are usually much rarer than the controls
+    if FLAGS.sampler:
+        data_holder.get_training_data().set_sampler(FLAGS.sampler)
+
+    # Optionally prepare the training batches on a background thread
+    prefetcher = None
+    if FLAGS.prefetch_batches > 0 and pipeline is not None:
+        print("The training batches are already prepared by the input queue's reader threads, so they will not be prefetched")
+    elif FLAGS.prefetch_batches > 0:
+        prefetcher = batch_prefetcher.BatchPrefetcher(data_holder.get_training_data(), FLAGS.train_batch_size, FLAGS.prefetch_batches)
+
     def feed_dict(training, batch_size):
         """ Make a TensorFlow feed_dict: maps data onto Tensor placeholders.
         """
-        if training:
+        if training and pipeline is not None:
+            # The training data is dequeued by the graph itself
+            return {keep_prob: FLAGS.dropout}
+        elif training and prefetcher is not None:
+            xs, y1s, y2s = prefetcher.next_batch()
+            k = FLAGS.dropout
+        elif training:
             xs, y1s, y2s = data_holder.get_training_data().next_batch(batch_size)
             k = FLAGS.dropout
         else:
             xs, y1s, y2s = data_holder.get_testing_data().next_batch(batch_size)
             k = 1.0
-        return {x: xs, y1_: y1s, y2_: y2s, keep_prob: k}
+        return {feed_inputs[0]: xs, feed_inputs[1]: y1s, feed_inputs[2]: y2s, keep_prob: k}
 
     # config = tf.ConfigProto(device_count={'GPU': 0})
-    best_iter = 0
     with tf.Session() as sess:
         # Set the random seed so that results will be reproducable.
         tf.set_random_seed(42)
 
-        # Create a saver this will be used to save the current best model.
+        # Create a checkpoint manager this will be used to save the current best model on a background thread.
         # If the model starts to over fit then it can be restored to the previous best version.
-        saver = tf.train.Saver()
+        checkpoints = None
+        if FLAGS.save_model:
+            checkpoints = checkpoint_manager.CheckpointManager(FLAGS.model_dir + 'model', max_to_keep=FLAGS.checkpoints_to_keep,
+                                                               min_save_interval=FLAGS.checkpoint_interval)
 
         train_writer = tf.train.SummaryWriter(FLAGS.log_dir + '/train', sess.graph)
         test_writer = tf.train.SummaryWriter(FLAGS.log_dir + '/test')
 
         sess.run(tf.initialize_all_variables())
-        save_path = ''
 
-        best_acc = 0
-        for i in range(FLAGS.max_steps):
+        if pipeline is not None:
+            pipeline.start(sess)
+
+        # Full tracing slows the traced steps down, so only sampled steps are traced and only if asked for
+        profile = profiler.Profiler(FLAGS.trace_every, FLAGS.trace_dir or None)
+
+        # The evaluation data is taken once and reused by every evaluation
+        evaluator = evaluation_scheduler.EvaluationScheduler(sess, [merged, accuracy1, accuracy2, loss1, loss2], feed_dict(False, FLAGS.test_batch_size),
+                                                             FLAGS.eval_interval, FLAGS.async_eval)
 
-            if i % 10 == 0:  # Record summaries and test-set accuracy
-                summary, acc1, acc2, cost1, cost2 = sess.run([merged, accuracy1, accuracy2, loss1, loss2], feed_dict=feed_dict(False, FLAGS.test_batch_size))
-                test_writer.add_summary(summary, i)
-                print('Accuracy at step %s for output 1: %f' % (i, acc1))
-                print('Accuracy at step %s for output 2: %f' % (i, acc2))
-                print('Cost at step %s for output 1: %f' % (i, cost1))
-                print('Cost at step %s for output 2: %f' % (i, cost2))
+        def record_evaluations():
+            """ Write the summaries of the finished evaluations, print their results and save the model if it has improved.
+            """
+            for (step, (summary, acc1, acc2, cost1, cost2), snapshot) in evaluator.get_results():
+                test_writer.add_summary(summary, step)
+                print('Accuracy at step %s for output 1: %f' % (step, acc1))
+                print('Accuracy at step %s for output 2: %f' % (step, acc2))
+                print('Cost at step %s for output 1: %f' % (step, cost1))
+                print('Cost at step %s for output 2: %f' % (step, cost2))
 
                 # save the model every time a new best accuracy is reached
-                if acc1 + acc2 >= best_acc and FLAGS.save_model:
-                    best_cost = acc1 + acc2
-                    save_path = saver.save(sess, FLAGS.model_dir + 'model')
-                    print("saving model at iteration %i" % i)
-                    best_iter = i
+                if checkpoints is not None and checkpoints.update(sess, step, acc1 + acc2, snapshot):
+                    print("new best model at iteration %i" % step)
+
+        for i in range(FLAGS.max_steps):
+
+            if evaluator.is_due(i):  # Record summaries and test-set accuracy
+                evaluator.evaluate(i)
+                record_evaluations()
 
             else:  # Record train set summaries, and train
-                if i % 100 == 99:  # Record execution stats
-                    run_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
-                    run_metadata = tf.RunMetadata()
-                    summary, _ = sess.run([merged, train_step], feed_dict=feed_dict(True, FLAGS.train_batch_size), options=run_options, run_metadata=run_metadata)
-                    train_writer.add_run_metadata(run_metadata, 'step%03d' % i)
+                if profile.is_traced(i):  # Record execution stats
+                    run_args = profile.get_run_args(i)
+                    summary, _ = sess.run([merged, train_step], feed_dict=feed_dict(True, FLAGS.train_batch_size), **run_args)
+                    train_writer.add_run_metadata(run_args['run_metadata'], 'step%03d' % i)
+                    profile.record('step%03d' % i, run_args['run_metadata'])
                     train_writer.add_summary(summary, i)
                     print('Adding run metadata for', i)
 
@@ -129,25 +209,55 @@ def train_model(data_holder):
                     summary, _ = sess.run([merged, train_step], feed_dict=feed_dict(True, FLAGS.train_batch_size))
                     train_writer.add_summary(summary, i)
 
+            if FLAGS.async_eval:
+                record_evaluations()
+            if checkpoints is not None:
+                checkpoints.poll()
+
+        evaluator.stop()
+        record_evaluations()
+        if evaluator.get_num_skipped():
+            print("%i evaluations were skipped as the previous evaluation was still running" % evaluator.get_num_skipped())
+
         train_writer.close()
         test_writer.close()
 
-        if FLAGS.save_model:
-            print("Restoring model from iteration: %s" % best_iter)
-            saver.restore(sess, save_path)
-
-        run_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
-        run_metadata = tf.RunMetadata()
-        best_acc1, best_acc2, epi_snp_locations, epi_snp_counts = sess.run([accuracy1, accuracy2, epi_snps, count], feed_dict=feed_dict(False, None), options=run_options, run_metadata=run_metadata)
+        if pipeline is not None:
+            pipeline.stop(sess)
+
+        if prefetcher is not None:
+            prefetcher.stop()
+            stats = prefetcher.get_starvation_stats()
+            print("The training loop waited for %i of %i prefetched batches (%.1f percent), %f seconds in total"
+                  % (stats['starved'], stats['batches'], stats['starved_fraction']*100, stats['wait_time']))
+
+        if checkpoints is not None:
+            checkpoints.finish()
+            print("Wrote %i checkpoints" % checkpoints.get_num_saves())
+            print("Restoring model from iteration: %s" % checkpoints.restore_best(sess))
+
+        # The final evaluation is traced whenever profiling is on
+        run_args = profile.get_trace_args() if profile.is_enabled() else {}
+        if FLAGS.inference_chunk_size > 0:
+            # Stream the testing set through the model so that the memory needed does not grow with its size
+            inference = chunked_inference.ChunkedInference(sess, feed_inputs, keep_prob, accuracy1, (loss1, loss2),
+                                                           model.get_snp_counts(), model.get_snp_scores())
+            best_acc1, best_acc2, _, _, scorer = inference.run(data_holder.get_testing_data(), FLAGS.inference_chunk_size, run_args)
+        else:
+            test_feed = feed_dict(False, None)
+            best_acc1, best_acc2, (probability_sums, counts) = sess.run([accuracy1, accuracy2, model.get_snp_scores()], feed_dict=test_feed, **run_args)
+            scorer = snp_scorer.SnpScorer()
+            scorer.update(probability_sums, counts, len(test_feed[feed_inputs[0]]))
+        # Both paths rank the SNPs with the same scorer, so the ranking does not depend on the chunk size
+        epi_snp_locations, epi_snp_counts, _ = scorer.rank(FLAGS.top_snps or None)
         epi_snp_names = utilities.get_snp_headers(epi_snp_locations, data_holder.get_header_data())
         print("The best accuracies were %s and %s" % (best_acc1, best_acc2))
-        print("The SNPs predicted to cause epistasis are %s" % epi_snp_names)
+        print("The SNPs predicted to cause epistasis, most often predicted first, are %s" % epi_snp_names)
         print("Their respective occurrance counts are %s" % epi_snp_counts)
 
-        tl = timeline.Timeline(run_metadata.step_stats)
-        # print(tl.generate_chrome_trace_format(show_memory=True))
-        trace_file = tf.gfile.Open(name='../data/timeline', mode='w')
-        trace_file.write(tl.generate_chrome_trace_format(show_memory=True))
+        if run_args:
+            profile.record('final_evaluation', run_args['run_metadata'])
+        profile.finish()
 
 def main(args):
     """The main function which invokes the model_training function after reading the input data file.
@@ -171,24 +281,37 @@ def main(args):
 
     # Import data.
     print("Loading data from: %s" % FLAGS.file_in)
-    data_holder = dh.DataHolder()
+    data_holder = dh.DataHolder(binary_snp_labels=FLAGS.binary_snp_head)
+    # The type is only passed on when it was set, so that the readers' defaults are kept otherwise
+    dtype_args = {'dtype': np.dtype(FLAGS.dtype)} if FLAGS.dtype else {}
     if not FLAGS.read_binary:
         try:
-            data_holder.read_from_txt(FLAGS.file_in, FLAGS.tt_ratio, 1)
+            data_holder.read_from_txt(FLAGS.file_in, FLAGS.tt_ratio, 1, compact=FLAGS.compact, legacy_split=FLAGS.legacy_split, stratified=FLAGS.stratified,
+                                      **dtype_args)
         except IOError as excep:
             print("Unable to read from text file: %s" % FLAGS.file_in)
             print(excep)
             sys.exit(2)
         if FLAGS.write_binary:
             try:
-                data_holder.write_to_binary(FLAGS.file_in.replace('.txt', '.npz'))
+                if FLAGS.npy_dir:
+                    data_holder.write_to_npy_dir(FLAGS.file_in.replace('.txt', '_npy'))
+                else:
+                    data_holder.write_to_binary(FLAGS.file_in.replace('.txt', '.npz'))
             except IOError as excep:
                 print("Unable to write to binary file")
                 print(excep)
                 sys.exit(2)
     else:
         try:
-            data_holder.read_from_npz(FLAGS.file_in)
+            # A directory of .npy files is memory-mapped rather than read into memory
+            test_train_ratio = FLAGS.tt_ratio if FLAGS.resplit_binary else None
+            if os.path.isdir(FLAGS.file_in):
+                data_holder.read_from_npy_dir(FLAGS.file_in, test_train_ratio=test_train_ratio, valid_train_ratio=1, stratified=FLAGS.stratified,
+                                              **dtype_args)
+            else:
+                data_holder.read_from_npz(FLAGS.file_in, test_train_ratio=test_train_ratio, valid_train_ratio=1, stratified=FLAGS.stratified,
+                                          **dtype_args)
         except IOError as excep:
             print("Unable to read from binary file: %s" % FLAGS.file_in)
             print(excep)
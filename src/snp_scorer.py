@@ -0,0 +1,129 @@
+"""This module provides a single class: SnpScorer, which scores and ranks the SNPs predicted to cause epistasis across batches.
+"""
+
+import numpy as np
+
+
+class SnpScorer(object):
+    """A class which accumulates per SNP scores of output 2 over any number of batches.
+
+    Two scores are kept for each SNP: the sum of its 'causing epi' probability and the number of samples in which that
+    probability reaches the cut off. Both are reductions over the batch axis, so the memory used is proportional to the number
+    of SNPs however many samples are scored, and the scores of a whole data set can be built up one batch at a time.
+    The sums can come from the graph (see utilities.score_snps) or be computed here from a batch of output 2 probabilities.
+    """
+
+    def __init__(self, cut_off_prob=0.5):
+        """Creates a SnpScorer with no scores.
+
+        Arguments:
+            cut_off_prob: a float describing the probability at which a SNP is predicted to cause epistasis in a sample.
+                It is only used by update_from_probs, as the graph applies its own cut off.
+
+        Returns:
+            A SnpScorer object.
+        """
+        self.__cut_off_prob = cut_off_prob
+        self.reset()
+
+    def reset(self):
+        """Clears the scores so that a new data set can be scored.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.__probability_sums = None
+        self.__counts = None
+        self.__num_samples = 0
+
+    def update(self, probability_sums, counts, num_samples):
+        """Adds the scores of a batch.
+
+        Arguments:
+            probability_sums: a numpy array containing, for each SNP, the sum of its 'causing epi' probability over the batch.
+            counts: a numpy array containing, for each SNP, the number of samples of the batch in which it was predicted.
+            num_samples: an int describing the number of samples in the batch.
+
+        Returns:
+            Nothing.
+        """
+        probability_sums = np.asarray(probability_sums, dtype=np.float64).ravel()
+        counts = np.asarray(counts, dtype=np.int64).ravel()
+        if self.__counts is None:
+            self.__probability_sums = np.zeros_like(probability_sums)
+            self.__counts = np.zeros_like(counts)
+        elif counts.shape != self.__counts.shape:
+            raise ValueError("Expected scores for %i SNPs, but got %i" % (self.__counts.shape[0], counts.shape[0]))
+        self.__probability_sums += probability_sums
+        self.__counts += counts
+        self.__num_samples += num_samples
+
+    def update_from_probs(self, probs, already_split=False):
+        """Adds the scores of a batch of output 2 probabilities.
+
+        Arguments:
+            probs: a numpy array of output 2 probabilities with shape (samples, snps, 2), or (samples, snps, 1) if already_split.
+            already_split: a bool describing whether probs only holds the 'causing epi' channel.
+
+        Returns:
+            Nothing.
+        """
+        probs = np.asarray(probs)
+        causing_probs = probs[..., 0] if not already_split or probs.ndim == 3 else probs
+        self.update(np.sum(causing_probs, axis=0, dtype=np.float64),
+                    np.count_nonzero(causing_probs >= self.__cut_off_prob, axis=0), causing_probs.shape[0])
+
+    def get_num_samples(self):
+        """Returns the number of samples which have been scored.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            An int number of samples.
+        """
+        return self.__num_samples
+
+    def get_counts(self):
+        """Returns the number of samples in which each SNP was predicted to cause epistasis.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A numpy array containing a count per SNP, or None if nothing has been scored.
+        """
+        return self.__counts
+
+    def get_mean_probs(self):
+        """Returns the mean 'causing epi' probability of each SNP.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            A numpy array containing a mean probability per SNP, or None if nothing has been scored.
+        """
+        if self.__counts is None:
+            return None
+        return self.__probability_sums/max(self.__num_samples, 1)
+
+    def rank(self, k=None, min_count=1):
+        """Ranks the SNPs by how often they were predicted, then by their mean probability.
+
+        Arguments:
+            k: an int describing the number of top ranked SNPs to return, or None to return all of them.
+            min_count: an int describing the number of samples a SNP must be predicted in to be ranked. 0 ranks every SNP.
+
+        Returns:
+            A triple containing (snps, counts, mean_probs), each a numpy array in ranked order. Equally scored SNPs are in index order.
+        """
+        if self.__counts is None:
+            return (np.array([], dtype=np.intp), np.array([], dtype=np.int64), np.array([], dtype=np.float64))
+        mean_probs = self.get_mean_probs()
+        snps = np.flatnonzero(self.__counts >= min_count)
+        snps = snps[np.lexsort((snps, -mean_probs[snps], -self.__counts[snps]))][:k]
+        return (snps, self.__counts[snps], mean_probs[snps])
@@ -165,6 +165,55 @@ def pool_layer(x, shape=[1, 3, 3, 1], strides=[1, 1, 1, 1], padding='SAME', name
         print("%s shape: %s" % (layer_name, pooled.get_shape()))
         return pooled
 
+def snp_output_layer(x, input_dim, num_snps, num_states, layer_name='identity', head='dense', rank=32):
+    """Reusable code for making the layer which gives the logits of every snp's states, with a choice of how its weights scale.
+
+    The following heads are available:
+        dense: a fully connected layer, with input_dim*num_snps*num_states weights.
+        factorized: a fully connected layer factorized through rank units, with (input_dim + num_snps*num_states)*rank weights.
+        local: a locally connected layer in which each snp only sees its own window of ceil(input_dim/num_snps) consecutive inputs,
+            with num_snps*ceil(input_dim/num_snps)*num_states weights. When num_snps divides input_dim the windows are the groups
+            of inputs in order, otherwise they are spread evenly over the inputs and neighbouring windows may overlap.
+
+    Arguments:
+        x: the tensor which must travel through the layer.
+        input_dim: the input tensor's dimension.
+        num_snps: the number of snps to give logits for.
+        num_states: the number of states of each snp.
+        layer_name: the layer name for the graph visualization.
+        head: a string describing which of the heads above to use.
+        rank: the number of units the factorized head is factorized through.
+
+    Returns:
+        a tensor of logits with shape [batch, num_snps, num_states], whichever head is used.
+    """
+    if head == 'dense':
+        fc_out = fc_layer(x, input_dim, num_snps*num_states, layer_name=layer_name, act=tf.identity)
+        return reshape(fc_out, [-1, num_snps, num_states], name_suffix='3')
+    if head == 'factorized':
+        # the two factors have no activation between them, so they are a rank limited version of the dense layer
+        with tf.name_scope(layer_name):
+            low_rank = fc_layer(x, input_dim, rank, layer_name='factor_1', act=tf.identity)
+            fc_out = fc_layer(low_rank, rank, num_snps*num_states, layer_name='factor_2', act=tf.identity)
+        return reshape(fc_out, [-1, num_snps, num_states], name_suffix='3')
+    if head == 'local':
+        window = -(-input_dim // num_snps)
+        # the first input of each snp's window, kept inside the inputs when the windows do not fit exactly
+        starts = np.minimum(np.arange(num_snps) * input_dim // num_snps, input_dim - window)
+        window_indices = starts[:, np.newaxis] + np.arange(window)
+        with tf.name_scope(layer_name):
+            with tf.name_scope('weights'):
+                weights = tn_weight_variable([num_snps, window, num_states])
+            with tf.name_scope('biases'):
+                biases = bias_variable([num_snps, num_states])
+            with tf.name_scope('Wx_plus_b'):
+                # gather each snp's window of inputs into a [batch, num_snps, window] tensor, then apply that snp's weights only
+                x_windows = tf.transpose(tf.gather(tf.transpose(x), window_indices), [2, 0, 1])
+                logits = tf.reduce_sum(tf.expand_dims(x_windows, 3) * weights, 2) + biases
+        print("%s shape: %s" % (layer_name, logits.get_shape()))
+        return logits
+    raise ValueError("Unknown output head '%s', use 'dense', 'factorized' or 'local'" % head)
+
 def dropout(x, name_suffix='1', keep_prob=None):
     """Apply dropout to a neural network layer.
     This is done to prevent over fitting.
@@ -206,6 +255,82 @@ def calculate_cross_entropy(y, y_, name_suffix='1'):
         tf.scalar_summary('cross_entropy_'+name_suffix, cross_entropy)
         return cross_entropy
 
+def calculate_softmax_cross_entropy(logits, y_, name_suffix='1'):
+    """Calculate the cross entropy as a loss function from the logits of a softmax output, using the fused and numerically stable kernel.
+
+    The result is scaled to match calculate_cross_entropy applied to the softmax of the logits, so either can be used as the loss.
+
+    Arguments:
+        logits: the given output tensor before the softmax, with the states as its last dimension.
+        y_: the expected output tensor.
+        name_suffix: the suffix of the name for the graph visualization. The default value is '1'.
+
+    Returns:
+        the cross entropy of the expexted and given outputs.
+    """
+    with tf.name_scope('cross_entropy_'+name_suffix):
+        # the fused kernel takes one distribution per row, so every dimension but the states is flattened into the rows
+        num_states = logits.get_shape().as_list()[-1]
+        flat_logits = tf.reshape(logits, [-1, num_states])
+        flat_labels = tf.reshape(y_, [-1, num_states])
+        diff = tf.nn.softmax_cross_entropy_with_logits(logits=flat_logits, labels=flat_labels)
+        with tf.name_scope('total'):
+            # calculate_cross_entropy takes the mean over the states as well as the rows
+            cross_entropy = tf.reduce_mean(diff) / num_states
+        tf.scalar_summary('cross_entropy_'+name_suffix, cross_entropy)
+        return cross_entropy
+
+def calculate_sigmoid_cross_entropy(logits, y_, name_suffix='1'):
+    """Calculate the cross entropy as a loss function from the logits of a per snp sigmoid output, using the numerically stable kernel.
+
+    A sigmoid of one logit is a softmax over the logit and zero, so the result is scaled to match calculate_cross_entropy of that 2-state softmax.
+
+    Arguments:
+        logits: the given output tensor before the sigmoid, with a single state as its last dimension.
+        y_: the expected output tensor, either with the same shape as the logits or 1-hot with the 'causing epi' state first.
+        name_suffix: the suffix of the name for the graph visualization. The default value is '1'.
+
+    Returns:
+        the cross entropy of the expexted and given outputs.
+    """
+    with tf.name_scope('cross_entropy_'+name_suffix):
+        diff = tf.nn.sigmoid_cross_entropy_with_logits(logits, get_causing_epi_probs(y_))
+        with tf.name_scope('total'):
+            # calculate_cross_entropy takes the mean over both states of each snp
+            cross_entropy = tf.reduce_mean(diff) / 2
+        tf.scalar_summary('cross_entropy_'+name_suffix, cross_entropy)
+        return cross_entropy
+
+def select_losses(logits1, logits2, output1, output2, y1_, y2_, fused_loss=False, binary_snp_head=False):
+    """Builds the loss of each output, choosing the cross entropy which suits the output 2 head and whether the fused kernel is used.
+
+    Arguments:
+        logits1: the output 1 tensor before the softmax.
+        logits2: the output 2 tensor before the softmax or sigmoid.
+        output1: the output 1 tensor.
+        output2: the output 2 tensor.
+        y1_: the expected output 1 tensor.
+        y2_: the expected output 2 tensor.
+        fused_loss: a bool describing whether to compute the softmax losses from the logits with the fused softmax cross entropy.
+        binary_snp_head: a bool describing whether output 2 is a single sigmoid state per snp rather than a softmax.
+
+    Returns:
+        (loss1, loss2) - the losses of output 1 and output 2 respectively.
+    """
+    # with fused_loss the losses are found from the logits with the fused kernel, which does not materialise the log probabilities
+    if fused_loss:
+        loss1 = calculate_softmax_cross_entropy(logits1, y1_, name_suffix='1')
+    else:
+        loss1 = calculate_cross_entropy(output1, y1_, name_suffix='1')
+    if binary_snp_head:
+        # a single state per snp is always trained with the sigmoid cross entropy of its logit
+        loss2 = calculate_sigmoid_cross_entropy(logits2, y2_, name_suffix='2')
+    elif fused_loss:
+        loss2 = calculate_softmax_cross_entropy(logits2, y2_, name_suffix='2')
+    else:
+        loss2 = calculate_cross_entropy(output2, y2_, name_suffix='2')
+    return loss1, loss2
+
 # training utilities
 
 class Optimizer(Enum):
@@ -275,6 +400,45 @@ def calculate_epi_accuracy(y, y_, snps_to_check=0, name_suffix='1'):
             tf.scalar_summary('accuracy_epi_'+name_suffix, accuracy)
         return accuracy
 
+def count_snp_predictions(y, y_, cut_off_prob=0.5, already_split=False):
+    """Counts the true positive, false positive and false negative snp predictions of a batch with elementwise masks.
+
+    Arguments:
+        y: the given output tensor.
+        y_: the expected output tensor.
+        cut_off_prob: float describing the cutoff probability for a snp to be described as predicted to cause.
+        already_split: Bool defaulting as False. Describes whether model is 2-classifer (False) or 1-classifier (True).
+
+    Returns:
+        (true_positives, false_positives, false_negatives) - scalar int32 tensors counting the (sample, snp) cells of each kind.
+    """
+    with tf.name_scope('snp_prediction_counts'):
+        if not already_split:
+            y_left = get_causing_epi_probs(y)
+        else:
+            y_left = y
+        labels_left = get_causing_epi_probs(y_)
+        predicted = tf.greater_equal(y_left, cut_off_prob)
+        expected = tf.not_equal(labels_left, 0)
+        true_positives = tf.reduce_sum(tf.cast(tf.logical_and(predicted, expected), tf.int32))
+        false_positives = tf.reduce_sum(tf.cast(tf.logical_and(predicted, tf.logical_not(expected)), tf.int32))
+        false_negatives = tf.reduce_sum(tf.cast(tf.logical_and(tf.logical_not(predicted), expected), tf.int32))
+        return true_positives, false_positives, false_negatives
+
+def snp_accuracy_from_counts(true_positives, false_positives, false_negatives):
+    """Calculates the snp accuracy, the true positives over every cell which was predicted or expected to cause, from prediction counts.
+
+    Arguments:
+        true_positives: a tensor counting the correctly predicted snps.
+        false_positives: a tensor counting the snps predicted but not expected to cause.
+        false_negatives: a tensor counting the snps expected but not predicted to cause.
+
+    Returns:
+        a scalar describing the accuracy.
+    """
+    all_predictions = true_positives + false_positives + false_negatives
+    return tf.cast(true_positives, tf.float32) / tf.cast(all_predictions, tf.float32)
+
 def calculate_snp_accuracy(y, y_, cut_off_prob=0.5, already_split=False, name_suffix='1'):
     """Compares the snp output of the neural network with the expected snp output and returns the accuracy.
 
@@ -291,33 +455,11 @@ def calculate_snp_accuracy(y, y_, cut_off_prob=0.5, already_split=False, name_su
     Returns:
         a scalar describing the accuracy of the given snp output when compared with the expected snp output.
     """
-
-    # split y, labels
     with tf.name_scope('accuracy_snp_'+name_suffix):
-        if not already_split:
-            y_left = get_causing_epi_probs(y)
-        else:
-            y_left = y
-        labels_left = get_causing_epi_probs(y_)
-        with tf.name_scope('predictions'):
-            # find indices of predictions >.5
-            predicted_snps = tf.where(tf.greater_equal(y_left, cut_off_prob))
-            # tf.gather_nd on labels_left to get a 0s/1s tensor -> size stored at [0] on shape (2)
-            prediction_results = tf.gather_nd(labels_left, predicted_snps)
-            shape_of_output = tf.shape(prediction_results)
-        # find number of 1s -> stored at [0] on shape (2)
-        with tf.name_scope('correct_predictions'):
-            correct_predictions = tf.shape(tf.where(tf.cast(prediction_results, tf.bool)))
-        # find number of 1s in labels_left -> stored at [0] on shape (2)
-        with tf.name_scope('expected_output'):
-            indices_of_ones_labels = tf.where(tf.cast(labels_left, tf.bool))
-            number_of_ones_labels = tf.shape(indices_of_ones_labels)
-        # Find predictions_length = incorrect predictions + correct predictions + missed predictions -> stored at [0] on shape (2)
-        with tf.name_scope('all_predictions'):
-            all_predictions = number_of_ones_labels - correct_predictions + shape_of_output
-        # accuracy = correct_predictions / all_predictions -> stored at [0] on shape (2)
+        # the counts are fixed size reductions of boolean masks, so no index tensors of the predicted cells are built
+        counts = count_snp_predictions(y, y_, cut_off_prob, already_split)
         with tf.name_scope('accuracy_snp'):
-            accuracy = (tf.cast(correct_predictions, tf.float32) / tf.cast(all_predictions, tf.float32))[0]
+            accuracy = snp_accuracy_from_counts(*counts)
         tf.scalar_summary('accuracy_snp_'+name_suffix, accuracy)
         return accuracy
 
@@ -346,6 +488,27 @@ def predict_snps(y, cut_off_prob=0.5, already_split=False):
         top_pred_snps, _, count = tf.unique_with_counts(top_snp_indices)
         return top_pred_snps, count
 
+def score_snps(y, cut_off_prob=0.5, already_split=False):
+    """Scores every snp over a batch with fixed size reductions, rather than the sample by snp index tensor built by predict_snps.
+
+    Arguments:
+        y: the given output tensor
+        cut_off_prob: float describing the cutoff probability for a snp to be described as predicted to cause.
+        already_split: Bool defaulting as False. Describes whether model is 2-classifer (False) or 1-classifier (True).
+
+    Returns:
+        probability_sums: a tensor with the sum over the batch of each snp's 'causing epi' probability
+        counts: a tensor with the number of samples in which each snp is predicted to cause
+    """
+    with tf.name_scope('snp_scores'):
+        if not already_split:
+            y_left = get_causing_epi_probs(y)
+        else:
+            y_left = y
+        probability_sums = tf.reduce_sum(y_left, [0, 2])
+        counts = tf.reduce_sum(tf.cast(tf.greater_equal(y_left, cut_off_prob), tf.int32), [0, 2])
+        return probability_sums, counts
+
 def get_snp_headers(snp_labels, headers):
     """non-tensorflow funtion to find the header names for the snp labels
 
@@ -356,10 +519,25 @@ def get_snp_headers(snp_labels, headers):
     Returns:
         snp_headers: a numpy array with the snp label names
     """
-    snp_names = np.array([])
-    for snp in np.nditer(snp_labels):
-        snp_names = np.append(snp_names, headers[snp])
-    return snp_names
+    # A single lookup, rather than growing the array one name at a time, keeps this linear in the number of snps
+    return np.asarray(headers)[np.asarray(snp_labels, dtype=np.intp).ravel()]
+
+def rank_snp_headers(snp_labels, counts, headers):
+    """non-tensorflow funtion to find the header names for the snp labels and order them from the most to the least often predicted
+
+    Arguments:
+        snp_labels: a numpy array with the snp labels to find
+        counts: a numpy array with the number of times each snp label was predicted
+        headers: a numpy array with the headers for all the snp columns
+
+    Returns:
+        A triple containing (snp_headers, snp_labels, counts), each a numpy array sorted by count in descending order.
+        Snps with equal counts keep their given order.
+    """
+    snp_labels = np.asarray(snp_labels, dtype=np.intp).ravel()
+    counts = np.asarray(counts).ravel()
+    order = np.argsort(-counts, kind='mergesort')
+    return get_snp_headers(snp_labels[order], headers), snp_labels[order], counts[order]
 
 def get_causing_epi_probs(tensor_in):
     """Gets the 'causing epi' probabilities on a (?, ?, 2) tensor containing predictions of whether snps are causing epi
@@ -370,6 +548,9 @@ def get_causing_epi_probs(tensor_in):
     Returns:
         y_left: a tensor with the 'causing epi' probabilities
     """
+    if tensor_in.get_shape().as_list()[-1] == 1:
+        # a tensor with a single state per snp, such as binary snp labels, only holds the 'causing epi' probabilities
+        return tensor_in
     with tf.name_scope('split'):
         left, _ = tf.split(2, 2, tensor_in, name='split')
         return left
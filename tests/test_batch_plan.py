@@ -0,0 +1,66 @@
+"""This module provides test cases for the BatchPlan class."""
+
+import sys
+import unittest
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import batch_errors
+import batch_plan
+
+class BatchBoundsTestCase(unittest.TestCase):
+    """Provides a test for the bounds of the batches of an epoch."""
+
+    def runTest(self):
+        """Asserts that an epoch starting part way through the data is planned as whole batches followed by one batch which wraps into the next epoch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        plan = batch_plan.BatchPlan(10, 4, offset=1)
+        self.assertEqual([plan.get_batch(i) for i in range(plan.get_num_batches())], [(1, 5, 0), (5, 9, 0), (9, 10, 3)])
+        self.assertEqual(plan.get_next_offset(), 3)
+
+        plan = batch_plan.BatchPlan(12, 4)
+        self.assertEqual([plan.get_batch(i) for i in range(plan.get_num_batches())], [(0, 4, 0), (4, 8, 0), (8, 12, 0)])
+        self.assertEqual(plan.get_next_offset(), 0)
+
+class DropLastBatchBoundsTestCase(unittest.TestCase):
+    """Provides a test for the bounds of the batches of an epoch when the last partial batch is dropped."""
+
+    def runTest(self):
+        """Asserts that only whole batches are planned and that the next epoch starts at the beginning of the data.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        plan = batch_plan.BatchPlan(10, 4, drop_last=True)
+        self.assertEqual([plan.get_batch(i) for i in range(plan.get_num_batches())], [(0, 4, 0), (4, 8, 0)])
+        self.assertEqual(plan.get_next_offset(), 0)
+
+class InvalidBatchSizeTestCase(unittest.TestCase):
+    """Provides a test for rejecting an invalid batch size."""
+
+    def runTest(self):
+        """Asserts that batch sizes of 0 or more than the number of samples raise a BatchSizeError.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.assertRaises(batch_errors.BatchSizeError):
+            batch_plan.BatchPlan(10, 0)
+        with self.assertRaises(batch_errors.BatchSizeError):
+            batch_plan.BatchPlan(10, 11)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""This module provides test cases for the BatchPrefetcher class."""
+
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import batch_errors
+import batch_prefetcher
+import data_batcher
+
+class BaseBatchPrefetcherTestCase(unittest.TestCase):
+    """Provides set up and tear down functions which can be inherited by other test case classes for the BatchPrefetcher."""
+
+    def setUp(self):
+        """Sets up a BatchPrefetcher which prefetches batches of 3 from a DataBatcher containing 10 samples.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.x = np.array([range(10), range(10), range(10)]).T
+        self.y1 = np.array([range(10)]).T
+        self.y2 = np.array([range(10), range(10)]).T
+        self.bp = batch_prefetcher.BatchPrefetcher(data_batcher.DataBatcher(self.x, self.y1, self.y2), 3, num_batches_ahead=2)
+
+    def tearDown(self):
+        """Stops the BatchPrefetcher created in the set up.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.bp.stop()
+
+class PrefetchedBatchesMatchSequentialBatchesTestCase(BaseBatchPrefetcherTestCase):
+    """Provides a test for checking that prefetched batches are the same as those taken directly from a DataBatcher.
+
+    Inherits from the BaseBatchPrefetcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that the BatchPrefetcher returns the same batches, in the same order, as a DataBatcher including across epoch roll overs.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        db = data_batcher.DataBatcher(self.x, self.y1, self.y2)
+        for _ in range(8):
+            for (expected, actual) in zip(db.next_batch(3), self.bp.next_batch()):
+                self.assertTrue(np.array_equal(expected, actual))
+
+class StarvationStatsTestCase(BaseBatchPrefetcherTestCase):
+    """Provides a test for the starvation statistics.
+
+    Inherits from the BaseBatchPrefetcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that the number of batches is counted and that no more batches are starved than were returned.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        for _ in range(5):
+            self.bp.next_batch()
+        stats = self.bp.get_starvation_stats()
+        self.assertEqual(stats['batches'], 5)
+        self.assertLessEqual(stats['starved'], 5)
+        self.assertGreaterEqual(stats['wait_time'], 0.0)
+
+class ErrorsAreRaisedByNextBatchTestCase(unittest.TestCase):
+    """Provides a test for checking that an error raised on the background thread is raised again by next_batch."""
+
+    def runTest(self):
+        """Asserts that a batch size larger than the data set raises an error in the caller of next_batch rather than only on the background thread.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(10), range(10), range(10)]).T
+        y1 = np.array([range(10)]).T
+        y2 = np.array([range(10), range(10)]).T
+        bp = batch_prefetcher.BatchPrefetcher(data_batcher.DataBatcher(x, y1, y2), 11)
+        with self.assertRaises(batch_errors.BatchSizeError):
+            bp.next_batch()
+        bp.stop()
+
+if __name__ == "__main__":
+    unittest.main()
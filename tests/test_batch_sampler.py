@@ -0,0 +1,94 @@
+"""This module provides test cases for the BatchSampler class."""
+
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import batch_sampler
+
+class BaseBatchSamplerTestCase(unittest.TestCase):
+    """Provides a set up function which can be inherited by other test case classes for the BatchSampler."""
+
+    def setUp(self):
+        """Sets up 105 labels of which 5 are cases, as in a 1:20 case/control cohort.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.labels = np.array([0]*50 + [1]*5 + [0]*50, dtype=np.int8)
+
+class BalancedBatchesTestCase(BaseBatchSamplerTestCase):
+    """Provides a test for the 'balanced' strategy.
+
+    Inherits from the BaseBatchSamplerTestCase.
+    """
+    def runTest(self):
+        """Asserts that every balanced batch is half cases and that every case is drawn before any case is repeated.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        sampler = batch_sampler.BatchSampler(self.labels, 'balanced')
+        batches = [sampler.sample(10) for _ in range(4)]
+        for batch in batches:
+            self.assertEqual(np.sum(self.labels[batch]), 5)
+            self.assertEqual(len(np.unique(batch)), 10)
+        cases = np.concatenate([batch[self.labels[batch] == 1] for batch in batches])
+        self.assertTrue(np.array_equal(np.sort(cases[:5]), np.arange(50, 55)))
+
+class WeightedBatchesTestCase(BaseBatchSamplerTestCase):
+    """Provides a test for the 'weighted' strategy.
+
+    Inherits from the BaseBatchSamplerTestCase.
+    """
+    def runTest(self):
+        """Asserts that inverse class frequency weights draw roughly as many cases as controls and that user weights of zero are never drawn.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        sampler = batch_sampler.BatchSampler(self.labels, 'weighted')
+        drawn = np.concatenate([sampler.sample(100) for _ in range(20)])
+        self.assertAlmostEqual(np.mean(self.labels[drawn]), 0.5, delta=0.05)
+
+        weights = np.zeros(len(self.labels))
+        weights[[3, 52]] = [1.0, 3.0]
+        drawn = batch_sampler.BatchSampler(self.labels, 'weighted', weights).sample(50)
+        self.assertTrue(set(drawn) <= set([3, 52]))
+
+class InvalidSamplerArgumentsTestCase(BaseBatchSamplerTestCase):
+    """Provides a test for rejecting invalid sampler arguments.
+
+    Inherits from the BaseBatchSamplerTestCase.
+    """
+    def runTest(self):
+        """Asserts that an unknown strategy, the wrong number of weights and negative weights raise a ValueError.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.assertRaises(ValueError):
+            batch_sampler.BatchSampler(self.labels, 'uniform')
+        with self.assertRaises(ValueError):
+            batch_sampler.BatchSampler(self.labels, 'weighted', np.ones(3))
+        with self.assertRaises(ValueError):
+            batch_sampler.BatchSampler(self.labels, 'weighted', -np.ones(len(self.labels)))
+
+if __name__ == "__main__":
+    unittest.main()
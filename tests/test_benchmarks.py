@@ -0,0 +1,203 @@
+"""This module provides benchmark test cases which check that the optimised data processing paths give the same results as, and run faster than, the original implementations.
+
+The timing checks depend on the load of the machine, so they are skipped unless the RUN_BENCHMARKS environment variable is set.
+"""
+
+import os
+import sys
+import timeit
+import unittest
+
+import numpy as np
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import data_batcher
+import data_loader
+
+RUN_BENCHMARKS = bool(os.environ.get('RUN_BENCHMARKS'))
+
+def legacy_convert_data_to_1_hot(x, y1, y2):
+    """The original loop based 1-hot encoding used by DataLoader.convert_data_to_1_hot.
+
+    Arguments:
+        x: a numpy array of genotype codes with shape (samples, loci).
+        y1: a numpy array of case/control labels with shape (samples,).
+        y2: a numpy array of causal SNP labels with shape (samples, loci).
+
+    Returns:
+        A triple containing the 1-hot (x, y1, y2). Each element is a numpy array.
+    """
+    x_1_hot = np.zeros((x.shape[0], x.shape[1], 3))
+    for (i, row) in enumerate(x):
+        for (j, cell) in enumerate(row):
+            x_1_hot[i][j][0] = int(cell == 0)
+            x_1_hot[i][j][1] = int(cell == 1)
+            x_1_hot[i][j][2] = int(cell == 2)
+
+    y_1_hot_1 = np.zeros((y1.shape[0], 2))
+    for (i, cell) in enumerate(y1):
+        y_1_hot_1[i][0] = int(cell == 0)
+        y_1_hot_1[i][1] = int(cell == 1)
+
+    y_1_hot_2 = np.zeros([y2.shape[0], y2.shape[1], 2])
+    for (i, row) in enumerate(y2):
+        for (j, cell) in enumerate(row):
+            y_1_hot_2[i][j][0] = int(cell == 1)
+            y_1_hot_2[i][j][1] = int(cell == 0)
+
+    return (x_1_hot, y_1_hot_1, y_1_hot_2)
+
+def vectorized_convert_data_to_1_hot(x, y1, y2, dtype=np.float64):
+    """The vectorized 1-hot encoding used by DataLoader.convert_data_to_1_hot.
+
+    Arguments:
+        x: a numpy array of genotype codes with shape (samples, loci).
+        y1: a numpy array of case/control labels with shape (samples,).
+        y2: a numpy array of causal SNP labels with shape (samples, loci).
+        dtype: the numpy data type of the 1-hot arrays. It defaults to the type of the loop based encoding.
+
+    Returns:
+        A triple containing the 1-hot (x, y1, y2). Each element is a numpy array.
+    """
+    return (data_loader.genotypes_to_1_hot(x, dtype), data_loader.labels_to_1_hot(y1, dtype), data_loader.snp_labels_to_1_hot(y2, dtype))
+
+def feed_batch(batch):
+    """Converts a batch to float32 as a TensorFlow session does when it is fed to a float32 placeholder.
+
+    Arguments:
+        batch: a triple containing the 1-hot (x, y1, y2). Each element is a numpy array.
+
+    Returns:
+        A list containing the contiguous float32 (x, y1, y2).
+    """
+    return [np.ascontiguousarray(array, dtype=np.float32) for array in batch]
+
+class BaseOneHotEncodingTestCase(unittest.TestCase):
+    """Provides a set up function which can be inherited by other test case classes for the 1-hot encodings."""
+
+    sizes = [(50, 50), (200, 200), (500, 400)]
+
+    def setUp(self):
+        """Sets up random genotypes and labels at several matrix sizes.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        random_state = np.random.RandomState(42)
+        self.data = []
+        for (num_samples, num_loci) in self.sizes:
+            x = random_state.randint(0, 3, size=(num_samples, num_loci)).astype(np.int8)
+            y1 = random_state.randint(0, 2, size=num_samples).astype(np.int8)
+            y2 = np.outer(y1, random_state.randint(0, 2, size=num_loci)).astype(np.int8)
+            self.data.append((x, y1, y2))
+
+class OneHotEncodingMatchesLegacyTestCase(BaseOneHotEncodingTestCase):
+    """Provides a test comparing the loop based and vectorized 1-hot encodings at several matrix sizes.
+
+    Inherits from the BaseOneHotEncodingTestCase.
+    """
+    def runTest(self):
+        """Asserts that the vectorized encoding is bit-identical to the loop based encoding at every size.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        for (x, y1, y2) in self.data:
+            legacy = legacy_convert_data_to_1_hot(x, y1, y2)
+            vectorized = vectorized_convert_data_to_1_hot(x, y1, y2)
+            for (expected, actual) in zip(legacy, vectorized):
+                self.assertEqual(expected.dtype, actual.dtype)
+                self.assertTrue(np.array_equal(expected, actual))
+
+@unittest.skipUnless(RUN_BENCHMARKS, 'set RUN_BENCHMARKS to run the timing benchmarks')
+class OneHotEncodingBenchmarkTestCase(BaseOneHotEncodingTestCase):
+    """Provides a benchmark timing the loop based and vectorized 1-hot encodings at several matrix sizes.
+
+    Inherits from the BaseOneHotEncodingTestCase.
+    """
+    def runTest(self):
+        """Asserts that the vectorized encoding is faster than the loop based encoding at every size.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        for (x, y1, y2) in self.data:
+            legacy_time = min(timeit.repeat(lambda: legacy_convert_data_to_1_hot(x, y1, y2), number=1, repeat=3))
+            vectorized_time = min(timeit.repeat(lambda: vectorized_convert_data_to_1_hot(x, y1, y2), number=1, repeat=3))
+            self.assertLess(vectorized_time, legacy_time, "1-hot encoding of %i x %i: loops %fs, vectorized %fs"
+                            %(x.shape[0], x.shape[1], legacy_time, vectorized_time))
+
+class BaseFeedCostTestCase(unittest.TestCase):
+    """Provides a set up function which can be inherited by other test case classes for feeding float64 and float32 batches."""
+
+    def setUp(self):
+        """Sets up a compact float64 DataBatcher and a compact float32 DataBatcher of the same 2000 samples over 500 loci.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        random_state = np.random.RandomState(42)
+        x = random_state.randint(0, 3, size=(2000, 500)).astype(np.int8)
+        y1 = random_state.randint(0, 2, size=2000).astype(np.int8)
+        causal_mask = np.zeros(500, dtype=bool)
+        causal_mask[[3, 7]] = True
+        self.batchers = {}
+        for dtype in (np.float64, np.float32):
+            self.batchers[dtype] = data_batcher.DataBatcher(x, y1, None, compact=True, causal_mask=causal_mask, dtype=dtype)
+
+class FeedFloat32MatchesFloat64TestCase(BaseFeedCostTestCase):
+    """Provides a test comparing the float64 and float32 batches.
+
+    Inherits from the BaseFeedCostTestCase.
+    """
+    def runTest(self):
+        """Asserts that float32 batches are half the size of float64 batches and feed the same values.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        float64_batch, float32_batch = self.batchers[np.float64].next_batch(200), self.batchers[np.float32].next_batch(200)
+        for (expected, actual) in zip(feed_batch(float64_batch), feed_batch(float32_batch)):
+            self.assertTrue(np.array_equal(expected, actual))
+        self.assertEqual(float64_batch[0].nbytes, 2*float32_batch[0].nbytes)
+
+@unittest.skipUnless(RUN_BENCHMARKS, 'set RUN_BENCHMARKS to run the timing benchmarks')
+class FeedCostBenchmarkTestCase(BaseFeedCostTestCase):
+    """Provides a benchmark timing the per-step cost of preparing and feeding float64 and float32 batches.
+
+    Inherits from the BaseFeedCostTestCase.
+    """
+    def runTest(self):
+        """Asserts that float32 batches are cheaper to prepare and feed than float64 batches.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        times = {}
+        for (dtype, db) in self.batchers.items():
+            times[dtype] = min(timeit.repeat(lambda db=db: feed_batch(db.next_batch(200)), number=20, repeat=5))
+        self.assertLess(times[np.float32], times[np.float64], "Preparing and feeding a 200 x 500 batch: float64 %fs, float32 %fs per step"
+                        %(times[np.float64]/20, times[np.float32]/20))
+
+if __name__ == "__main__":
+    unittest.main()
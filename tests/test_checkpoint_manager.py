@@ -0,0 +1,93 @@
+"""This module provides test cases for the CheckpointManager class."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+
+import tensorflow as tf
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import checkpoint_manager
+
+class CheckpointManagerTest(tf.test.TestCase):
+    """Tests for the CheckpointManager class
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def setUp(self):
+        """Sets up a temporary directory to write the checkpoints to.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.checkpoint_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Removes the temporary directory created in the set up.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        shutil.rmtree(self.checkpoint_dir)
+
+    def testOnlyBestModelsAreSavedAndRestored(self):
+        """Asserts that only improvements are checkpointed, that a rate limited best model is written by finish, and that the best model is restored.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        weight = tf.Variable(1.0)
+        with self.test_session() as sess:
+            sess.run(tf.initialize_all_variables())
+            checkpoints = checkpoint_manager.CheckpointManager(self.checkpoint_dir + '/model', min_save_interval=3600.0)
+            self.assertTrue(checkpoints.update(sess, 0, 0.5))
+            sess.run(weight.assign(2.0))
+            self.assertFalse(checkpoints.update(sess, 10, 0.4))
+            self.assertTrue(checkpoints.update(sess, 20, 0.9, snapshot=[3.0]))
+            sess.run(weight.assign(4.0))
+            checkpoints.finish()
+
+            self.assertEqual(checkpoints.get_best(), (20, 0.9))
+            self.assertEqual(checkpoints.get_num_saves(), 2)
+            self.assertEqual(checkpoints.restore_best(sess), 20)
+            self.assertEqual(sess.run(weight), 3.0)
+
+    def testNanMetricsAreSkipped(self):
+        """Asserts that NaN metrics are never checkpointed, so that they do not stop later models from being compared with the best.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        weight = tf.Variable(1.0)
+        with self.test_session() as sess:
+            sess.run(tf.initialize_all_variables())
+            checkpoints = checkpoint_manager.CheckpointManager(self.checkpoint_dir + '/model', min_save_interval=0.0)
+            self.assertFalse(checkpoints.update(sess, 0, float('nan')))
+            self.assertEqual(checkpoints.get_best(), (None, None))
+            self.assertTrue(checkpoints.update(sess, 10, 0.5, snapshot=[2.0]))
+            self.assertFalse(checkpoints.update(sess, 20, float('nan')))
+            self.assertFalse(checkpoints.update(sess, 30, 0.4, snapshot=[3.0]))
+            checkpoints.finish()
+
+            self.assertEqual(checkpoints.get_best(), (10, 0.5))
+            self.assertEqual(checkpoints.restore_best(sess), 10)
+            self.assertEqual(sess.run(weight), 2.0)
+
+if __name__ == "__main__":
+    unittest.main()
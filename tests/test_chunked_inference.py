@@ -0,0 +1,76 @@
+"""This module provides test cases for the ChunkedInference class."""
+
+import sys
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import chunked_inference
+import data_batcher
+import data_loader
+import utilities
+
+class ChunkedInferenceTest(tf.test.TestCase):
+    """Tests for the ChunkedInference class
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def setUp(self):
+        """Sets up a graph whose outputs are softmaxes of random inputs, and a DataBatcher of 10 samples with random labels.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        random_state = np.random.RandomState(42)
+        self.x_data = random_state.normal(size=(10, 6, 2)).astype(np.float32)
+        y1_data = data_loader.labels_to_1_hot(random_state.randint(2, size=10))
+        y2_data = data_loader.snp_labels_to_1_hot(random_state.randint(2, size=(10, 6)))
+        self.batcher = data_batcher.DataBatcher(self.x_data, y1_data, y2_data)
+
+        self.x = tf.placeholder(tf.float32, [None, 6, 2])
+        self.y1_ = tf.placeholder(tf.float32, [None, 2])
+        self.y2_ = tf.placeholder(tf.float32, [None, 6, 2])
+        self.keep_prob = tf.placeholder(tf.float32)
+        output1 = tf.nn.softmax(tf.reduce_sum(self.x, 1))
+        self.output2 = tf.nn.softmax(tf.reshape(self.x, [-1, 2]))
+        self.output2 = tf.reshape(self.output2, [-1, 6, 2])
+        self.accuracy1 = utilities.calculate_epi_accuracy(output1, self.y1_)
+        self.accuracy2 = utilities.calculate_snp_accuracy(self.output2, self.y2_)
+        self.losses = (utilities.calculate_cross_entropy(output1, self.y1_, name_suffix='1'),
+                       utilities.calculate_cross_entropy(self.output2, self.y2_, name_suffix='2'))
+        self.snps, self.counts = utilities.predict_snps(self.output2)
+
+    def testChunksMatchSingleRun(self):
+        """Asserts that combining chunks which do not divide the data set evenly gives the same results as one run over all of it.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.test_session() as sess:
+            x_data, y1_data, y2_data = self.batcher.next_batch(None)
+            feed_dict = {self.x: x_data, self.y1_: y1_data, self.y2_: y2_data, self.keep_prob: 1.0}
+            expected = sess.run([self.accuracy1, self.accuracy2, self.losses[0], self.losses[1], self.snps, self.counts], feed_dict=feed_dict)
+
+            inference = chunked_inference.ChunkedInference(sess, (self.x, self.y1_, self.y2_), self.keep_prob, self.accuracy1, self.losses,
+                                                           utilities.count_snp_predictions(self.output2, self.y2_),
+                                                           utilities.score_snps(self.output2))
+            actual = inference.run(self.batcher, 3)
+            for (expected_value, actual_value) in zip(expected[:4], actual[:4]):
+                self.assertNear(expected_value, actual_value, err=1e-5)
+            snps, counts, _ = actual[4].rank()
+            self.assertAllEqual(np.sort(expected[4]), np.sort(snps))
+            self.assertAllEqual(expected[5][np.argsort(expected[4])], counts[np.argsort(snps)])
+
+if __name__ == "__main__":
+    unittest.main()
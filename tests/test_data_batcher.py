@@ -7,6 +7,7 @@ import numpy as np
 sys.path.append("../src/")
 sys.path.append("src/")
 
+import batch_errors
 import data_batcher
 
 class BaseDataBatcherTestCase(unittest.TestCase):
@@ -282,5 +283,308 @@ class EpochNumberIsCorrectlyReturnedWhenTakingMixedBatches(BaseDataBatcherTestCa
         _, _, _ = self.db.next_batch(5)
         self.assertEqual(2, self.db.get_num_epochs())
 
+class BaseCompactDataBatcherTestCase(unittest.TestCase):
+    """Provides a set up function which can be inherited by other test case classes for a compact DataBatcher."""
+
+    def setUp(self):
+        """Sets up a compact DataBatcher object initialised with genotype codes and labels for 10 samples and 4 SNPs.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.x = np.array([[i % 3, (i + 1) % 3, (i + 2) % 3, 0] for i in range(10)], dtype=np.int8)
+        self.y1 = np.array([i % 2 for i in range(10)], dtype=np.int8)
+        self.y2 = np.outer(self.y1, [0, 0, 1, 1]).astype(np.int8)
+        self.db = data_batcher.DataBatcher(self.x, self.y1, self.y2, compact=True)
+
+class CompactShapesTestCase(BaseCompactDataBatcherTestCase):
+    """Provides a test for returning the 1-hot shapes of compact data.
+
+    Inherits from the BaseCompactDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that a compact DataBatcher reports the shapes of the 1-hot data it will return.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.assertEqual(self.db.get_input_shape(), (10, 4, 3))
+        self.assertEqual(self.db.get_output1_shape(), (10, 2))
+        self.assertEqual(self.db.get_output2_shape(), (10, 4, 2))
+
+class CompactBatchesMatchOneHotBatchesTestCase(BaseCompactDataBatcherTestCase):
+    """Provides a test for checking that compact batches are expanded to the same values as 1-hot batches.
+
+    Inherits from the BaseCompactDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that a compact DataBatcher and a 1-hot DataBatcher return identical batches, including across an epoch roll over.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        one_hot_db = data_batcher.DataBatcher((self.x[..., np.newaxis] == np.arange(3)).astype(np.float64),
+                                              (self.y1[..., np.newaxis] == np.arange(2)).astype(np.float64),
+                                              (self.y2[..., np.newaxis] == np.array([1, 0])).astype(np.float64))
+        for batch_size in [4, 4, 4, None]:
+            for (expected, actual) in zip(one_hot_db.next_batch(batch_size), self.db.next_batch(batch_size)):
+                self.assertTrue(np.array_equal(expected, actual))
+
+class DerivedOutput2MatchesStoredOutput2TestCase(BaseCompactDataBatcherTestCase):
+    """Provides a test for checking that output 2 derived from a causal SNP mask matches the stored output 2.
+
+    Inherits from the BaseCompactDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that a compact DataBatcher without y2 returns the same shapes and batches as one which stores y2.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        derived_db = data_batcher.DataBatcher(self.x, self.y1, None, compact=True, causal_mask=np.array([False, False, True, True]))
+        self.assertEqual(derived_db.get_output2_shape(), self.db.get_output2_shape())
+        for batch_size in [4, 4, 4, None]:
+            for (expected, actual) in zip(self.db.next_batch(batch_size), derived_db.next_batch(batch_size)):
+                self.assertTrue(np.array_equal(expected, actual))
+
+class IndexedBatchesTestCase(BaseDataBatcherTestCase):
+    """Provides a test for batching only the samples at a given index vector.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that a DataBatcher with an index vector returns the indexed samples in order, rolls over correctly and reports the indexed size.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(10), range(10), range(10)]).T
+        y1 = np.array([range(10)]).T
+        y2 = np.array([range(10), range(10)]).T
+        db = data_batcher.DataBatcher(x, y1, y2, indices=np.array([7, 2, 9, 4]))
+        self.assertEqual(db.get_input_shape(), (4, 3))
+        self.assertEqual(db.get_output2_shape(), (4, 2))
+        x_batch, y1_batch, _ = db.next_batch(3)
+        self.assertEqual(list(x_batch[:, 0]), [7, 2, 9])
+        self.assertEqual(list(y1_batch[:, 0]), [7, 2, 9])
+        x_batch, _, y2_batch = db.next_batch(3)
+        self.assertEqual(list(x_batch[:, 0]), [4, 7, 2])
+        self.assertEqual(list(y2_batch[:, 1]), [4, 7, 2])
+        self.assertEqual(db.get_num_epochs(), 1)
+        x_batch, _, _ = db.next_batch(None)
+        self.assertEqual(list(x_batch[:, 0]), [7, 2, 9, 4])
+
+class UnshuffledEpochModeMatchesDefaultModeTestCase(BaseDataBatcherTestCase):
+    """Provides a test for checking that epoch mode without shuffling batches in the same order as the default mode.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that an unshuffled epoch mode DataBatcher returns the same batches and epoch counts as a default DataBatcher, including across roll overs.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(10), range(10), range(10)]).T
+        y1 = np.array([range(10)]).T
+        y2 = np.array([range(10), range(10)]).T
+        db = data_batcher.DataBatcher(x, y1, y2)
+        epoch_db = data_batcher.DataBatcher(x, y1, y2)
+        epoch_db.set_epoch_mode(shuffle=False)
+        for _ in range(8):
+            for (expected, actual) in zip(db.next_batch(3), epoch_db.next_batch(3)):
+                self.assertTrue(np.array_equal(expected, actual))
+            self.assertEqual(db.get_num_epochs(), epoch_db.get_num_epochs())
+
+class ShuffledEpochsVisitEverySampleOnceTestCase(BaseDataBatcherTestCase):
+    """Provides a test for checking that each shuffled epoch is a permutation of the samples.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that every epoch visits each indexed sample exactly once, that the epochs are in different orders and that the order is seeded.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(20), range(20)]).T
+        y1 = np.array([range(20)]).T
+        y2 = np.array([range(20)]).T
+        indices = np.arange(0, 20, 2)
+        orders = []
+        for _ in range(2):
+            db = data_batcher.DataBatcher(x, y1, y2, indices=indices)
+            db.set_epoch_mode(random_seed=7)
+            orders.append(np.concatenate([db.next_batch(5)[0][:, 0].copy() for _ in range(4)]))
+            self.assertEqual(db.get_num_epochs(), 2)
+        self.assertTrue(np.array_equal(orders[0], orders[1]))
+        self.assertTrue(np.array_equal(np.sort(orders[0][:10]), indices))
+        self.assertTrue(np.array_equal(np.sort(orders[0][10:]), indices))
+        self.assertFalse(np.array_equal(orders[0][:10], orders[0][10:]))
+
+class DropLastSkipsPartialBatchesTestCase(BaseDataBatcherTestCase):
+    """Provides a test for dropping the samples which do not fill a batch at the end of an epoch.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that with drop_last every batch comes from a single epoch and a new epoch is started when a batch cannot be filled.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(10)]).T
+        y1 = np.array([range(10)]).T
+        y2 = np.array([range(10)]).T
+        db = data_batcher.DataBatcher(x, y1, y2)
+        db.set_epoch_mode(shuffle=False, drop_last=True)
+        self.assertEqual([list(db.next_batch(4)[0][:, 0]) for _ in range(3)], [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 2, 3]])
+        self.assertEqual(db.get_num_epochs(), 1)
+
+class EpochModeReusesBatchBuffersTestCase(BaseDataBatcherTestCase):
+    """Provides a test for checking that epoch mode cycles through its preallocated batch buffers.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that a batch buffer is written to again only after num_buffers batches, including for batches which roll over.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(10), range(10), range(10)]).T
+        y1 = np.array([range(10)]).T
+        y2 = np.array([range(10), range(10)]).T
+        db = data_batcher.DataBatcher(x, y1, y2)
+        db.set_epoch_mode(shuffle=False, num_buffers=2)
+        batches = [db.next_batch(4) for _ in range(4)]
+        self.assertTrue(batches[0][0] is batches[2][0])
+        self.assertTrue(batches[1][0] is batches[3][0])
+        self.assertFalse(batches[2][0] is batches[3][0])
+        self.assertEqual(list(batches[2][0][:, 0]), [8, 9, 0, 1])
+        self.assertEqual(list(batches[3][0][:, 0]), [2, 3, 4, 5])
+
+class InvalidDataRaisesErrorsTestCase(BaseDataBatcherTestCase):
+    """Provides a test for the errors raised for data which cannot be batched.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that arrays with different numbers of samples raise a ShapeMismatchError and an oversized batch raises a BatchSizeError.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = np.array([range(10)]).T
+        y = np.array([range(9)]).T
+        with self.assertRaises(batch_errors.ShapeMismatchError):
+            data_batcher.DataBatcher(x, y, x)
+        with self.assertRaises(batch_errors.ShapeMismatchError):
+            data_batcher.DataBatcher(x, x, y)
+        with self.assertRaises(batch_errors.BatchSizeError):
+            data_batcher.DataBatcher(x, x, x).next_batch(11)
+
+class BalancedSamplerBatchesTestCase(BaseCompactDataBatcherTestCase):
+    """Provides a test for drawing class-balanced batches from an indexed compact DataBatcher.
+
+    Inherits from the BaseCompactDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that balanced batches drawn from indexed samples are half cases, stay within the indices and count epochs by the number of samples drawn.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        indices = np.array([0, 1, 2, 3, 5, 7])
+        db = data_batcher.DataBatcher(self.x, self.y1, self.y2, compact=True, indices=indices)
+        db.set_sampler('balanced')
+        for _ in range(3):
+            _, y1_batch, _ = db.next_batch(4)
+            self.assertEqual(np.sum(y1_batch[:, 1]), 2)
+        self.assertEqual(db.get_num_epochs(), 2)
+
+class ChunksCoverTheDataSetInOrderTestCase(BaseDataBatcherTestCase):
+    """Provides a test for streaming the whole data set in chunks.
+
+    Inherits from the BaseDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that the chunks join up to the whole data set and do not move the position of the next batch or count an epoch.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.db.next_batch(3)
+        chunks = list(self.db.get_chunks(4))
+        self.assertEqual([len(x) for (x, _, _) in chunks], [4, 4, 2])
+        self.assertTrue(np.array_equal(np.concatenate([x for (x, _, _) in chunks]), self.db.next_batch(None)[0]))
+        self.assertEqual(self.db.get_num_epochs(), 1)
+        x, _, _ = self.db.next_batch(3)
+        self.assertTrue(np.array_equal(x[:, 0], [3, 4, 5]))
+        with self.assertRaises(batch_errors.BatchSizeError):
+            list(self.db.get_chunks(0))
+
+class BinarySnpLabelsTestCase(BaseCompactDataBatcherTestCase):
+    """Provides a test for giving output 2 a single 'causing epi' state per SNP.
+
+    Inherits from the BaseCompactDataBatcherTestCase.
+    """
+    def runTest(self):
+        """Asserts that compact and 1-hot DataBatchers with binary SNP labels both return the 'causing epi' state of the 1-hot labels.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        one_hot_y2 = (self.y2[..., np.newaxis] == np.array([1, 0])).astype(np.float32)
+        compact_db = data_batcher.DataBatcher(self.x, self.y1, None, compact=True, causal_mask=np.array([False, False, True, True]),
+                                              binary_snp_labels=True)
+        one_hot_db = data_batcher.DataBatcher(self.x, self.y1, one_hot_y2, binary_snp_labels=True)
+        self.assertEqual(compact_db.get_output2_shape(), (10, 4, 1))
+        self.assertEqual(one_hot_db.get_output2_shape(), (10, 4, 1))
+        for batch_size in [4, 4, 4, None]:
+            _, _, compact_y2 = compact_db.next_batch(batch_size)
+            _, _, one_hot_batch_y2 = one_hot_db.next_batch(batch_size)
+            self.assertTrue(np.array_equal(compact_y2, one_hot_batch_y2))
+        self.assertTrue(np.array_equal(compact_db.next_batch(None)[2], one_hot_y2[..., :1]))
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 """This module provides test cases for the DataHolder class."""
 
+import shutil
 import sys
 import unittest
 from os import path, remove
@@ -142,5 +143,278 @@ class ReadBinaryTestCase(BaseDataHolderTestCase):
         """
         remove("tmp2.npz")
 
+class CompactReadTxtTestCase(BaseDataHolderTestCase):
+    """Provides a test for checking that compact data gives the same batches as 1-hot data.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that a DataHolder reading the file in compact form returns the same batches as one reading it in 1-hot form.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        dh2 = data_holder.DataHolder()
+        dh2.read_from_txt("tmp.txt", 0.8, 0.75, compact=True)
+
+        self.assertTrue(dh2.is_compact())
+        self.assertFalse(self.dh.is_compact())
+        self.assertEqual(dh2.get_training_data().get_input_shape(), self.dh.get_training_data().get_input_shape())
+        for (expected, actual) in zip(self.dh.get_testing_data().next_batch(None), dh2.get_testing_data().next_batch(None)):
+            self.assertTrue(np.array_equal(expected, actual))
+
+class CompactReadBinaryTestCase(BaseDataHolderTestCase):
+    """Provides a test for checking that compact data is written to and read from a binary file in compact form.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that a compact binary file is read back as compact data with the same batches.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        dh2 = data_holder.DataHolder()
+        dh2.read_from_txt("tmp.txt", 0.8, 0.75, compact=True)
+        dh2.write_to_binary("tmp2")
+
+        dh3 = data_holder.DataHolder()
+        dh3.read_from_npz("tmp2.npz")
+
+        self.assertTrue(dh3.is_compact())
+        for (expected, actual) in zip(self.dh.get_training_data().next_batch(None), dh3.get_training_data().next_batch(None)):
+            self.assertTrue(np.array_equal(expected, actual))
+
+    def tearDown(self):
+        """Removes the temporary binary file used for the test.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp2.npz")
+        BaseDataHolderTestCase.tearDown(self)
+
+class DataTypeIsStoredInBinaryTestCase(BaseDataHolderTestCase):
+    """Provides a test for checking that the data type of the 1-hot data is kept when it is written to and read from a binary file.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that the default data type is float32, that compact data read from a binary is expanded to the type it was written with,
+        and that 1-hot data can be converted to another type when it is read.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.assertEqual(self.dh.get_training_data().next_batch(5)[0].dtype, np.float32)
+
+        dh2 = data_holder.DataHolder()
+        dh2.read_from_txt("tmp.txt", 0.8, 0.75, compact=True, dtype=np.uint8)
+        dh2.write_to_binary("tmp2")
+        dh3 = data_holder.DataHolder()
+        dh3.read_from_npz("tmp2.npz")
+        self.assertEqual(dh3.get_dtype(), np.uint8)
+        for (expected, actual) in zip(self.dh.get_training_data().next_batch(None), dh3.get_training_data().next_batch(None)):
+            self.assertEqual(actual.dtype, np.uint8)
+            self.assertTrue(np.array_equal(expected, actual))
+
+        self.dh.write_to_binary("tmp3")
+        dh4 = data_holder.DataHolder()
+        dh4.read_from_npz("tmp3.npz", dtype=np.float16)
+        self.assertEqual(dh4.get_training_data().next_batch(5)[2].dtype, np.float16)
+
+    def tearDown(self):
+        """Removes the temporary binary files used for the test.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp2.npz")
+        remove("tmp3.npz")
+        BaseDataHolderTestCase.tearDown(self)
+
+class ReadNpyDirTestCase(BaseDataHolderTestCase):
+    """Provides a test for writing to and memory-mapping a directory of .npy files.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that memory-mapped data read from a .npy directory gives the same batches and headers as the data it was written from.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.dh.write_to_npy_dir("tmp_npy")
+
+        dh2 = data_holder.DataHolder()
+        dh2.read_from_npy_dir("tmp_npy")
+
+        self.assertTrue(np.array_equal(dh2.get_header_data(), self.dh.get_header_data()))
+        self.assertEqual(dh2.get_training_data().get_input_shape(), self.dh.get_training_data().get_input_shape())
+        for (expected, actual) in zip(self.dh.get_training_data().next_batch(7), dh2.get_training_data().next_batch(7)):
+            self.assertTrue(np.array_equal(expected, actual))
+
+    def tearDown(self):
+        """Removes the temporary directory used for the test.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        shutil.rmtree("tmp_npy")
+        BaseDataHolderTestCase.tearDown(self)
+
+class BinaryStoresDataOnceTestCase(BaseDataHolderTestCase):
+    """Provides a test for checking that a binary file stores the data once along with the split indices.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that the binary contains a single copy of the input data and the indices of each data set.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.dh.write_to_binary("tmp2")
+        npzfile = np.load("tmp2.npz")
+        self.assertIn('x', npzfile.files)
+        self.assertNotIn('training_x', npzfile.files)
+        self.assertEqual(npzfile['x'].shape, (100, 9, 3))
+        self.assertEqual((len(npzfile['training_indices']), len(npzfile['validation_indices']), len(npzfile['testing_indices'])), (60, 20, 20))
+
+    def tearDown(self):
+        """Removes the temporary binary file used for the test.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp2.npz")
+        BaseDataHolderTestCase.tearDown(self)
+
+class ResplitBinaryTestCase(BaseDataHolderTestCase):
+    """Provides a test for re-splitting a binary file with a different test-train ratio.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that a binary read with a new test-train ratio has data sets of the new sizes, and one read without a ratio keeps the stored split.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.dh.write_to_binary("tmp2")
+
+        dh2 = data_holder.DataHolder()
+        dh2.read_from_npz("tmp2.npz")
+        for (expected, actual) in zip(self.dh.get_testing_data().next_batch(None), dh2.get_testing_data().next_batch(None)):
+            self.assertTrue(np.array_equal(expected, actual))
+
+        dh2.read_from_npz("tmp2.npz", test_train_ratio=0.5, valid_train_ratio=1)
+        self.assertEqual(dh2.get_training_data().get_input_shape(), (50, 9, 3))
+        self.assertEqual(dh2.get_testing_data().get_input_shape(), (50, 9, 3))
+        self.assertEqual(dh2.get_validation_data().get_input_shape(), (0, 9, 3))
+
+    def tearDown(self):
+        """Removes the temporary binary file used for the test.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp2.npz")
+        BaseDataHolderTestCase.tearDown(self)
+
+class ReadSplitArraysBinaryTestCase(BaseDataHolderTestCase):
+    """Provides a test for reading a binary file written in the earlier format which stores each data set separately.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that a binary containing separate training, testing, and validation arrays is read into DataBatchers of the correct sizes.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        arrays = {}
+        for (name, batcher) in [('training', self.dh.get_training_data()), ('testing', self.dh.get_testing_data()), ('validation', self.dh.get_validation_data())]:
+            arrays[name + '_x'], arrays[name + '_y1'], arrays[name + '_y2'] = batcher.next_batch(None)
+        np.savez("tmp2", headers=self.dh.get_header_data(), **arrays)
+
+        dh2 = data_holder.DataHolder()
+        dh2.read_from_npz("tmp2.npz")
+        self.assertEqual(dh2.get_training_data().get_input_shape(), (60, 9, 3))
+        self.assertEqual(dh2.get_testing_data().get_output2_shape(), (20, 9, 2))
+        with self.assertRaises(ValueError):
+            dh2.get_k_fold_data(4)
+
+    def tearDown(self):
+        """Removes the temporary binary file used for the test.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp2.npz")
+        BaseDataHolderTestCase.tearDown(self)
+
+class KFoldDataTestCase(BaseDataHolderTestCase):
+    """Provides a test for creating DataBatchers for each fold of k-fold cross validation.
+
+    Inherits from the BaseDataHolderTestCase.
+    """
+    def runTest(self):
+        """Asserts that the DataHolder returns a pair of DataBatchers of the correct sizes for each fold, with the cases spread evenly.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        folds = self.dh.get_k_fold_data(4)
+        self.assertEqual(len(folds), 4)
+        for (training, testing) in folds:
+            self.assertIsInstance(training, data_batcher.DataBatcher)
+            self.assertEqual(training.get_input_shape(), (75, 9, 3))
+            self.assertEqual(testing.get_input_shape(), (25, 9, 3))
+            _, y1, _ = testing.next_batch(None)
+            self.assertIn(np.sum(y1[:, 1]), [12, 13])
+
 if __name__ == "__main__":
     unittest.main()
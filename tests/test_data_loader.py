@@ -4,6 +4,8 @@ import sys
 import unittest
 from os import remove
 
+import numpy as np
+
 sys.path.append("../src/")
 sys.path.append("src/")
 
@@ -119,6 +121,24 @@ class GetOutput2DataTestCase(BaseDataLoaderTestCase):
         self.assertEqual(y2[50, 7], 0)
         self.assertEqual(y2[99, 8], 0)
 
+class GetCausalMaskTestCase(BaseDataLoaderTestCase):
+    """Provides a test for checking that the causal SNPs have been correctly read from the header.
+
+    Inherits from the BaseDataLoaderTestCase.
+    """
+    def runTest(self):
+        """Asserts that the DataLoader marks only the SNPs whose headers start with 'M' as causal.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        mask = self.dl.get_causal_mask()
+        self.assertEqual(mask.shape, (9,))
+        self.assertTrue(np.array_equal(np.flatnonzero(mask), [7, 8]))
+
 class GetInputOneHotdataTestCase(BaseDataLoaderTestCase):
     """Provides a test for checking that the input data has been correctly converted to a 1-hot encoding.
 
@@ -245,6 +265,28 @@ class GetTrainingDataTestCase(BaseDataLoaderTestCase):
         self.assertEqual(len(y1), 60)
         self.assertEqual(len(y2), 60)
 
+class SplitsAreDisjointTestCase(BaseDataLoaderTestCase):
+    """Provides a test for checking that the training, validation and testing sets do not share any samples.
+
+    Inherits from the BaseDataLoaderTestCase.
+    """
+    def runTest(self):
+        """Asserts that the permutation and legacy splits both use every sample exactly once.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        for legacy_split in [False, True]:
+            dl = data_loader.DataLoader("tmp.txt", 0.8, 0.75)
+            dl.split_data(legacy_split=legacy_split)
+            training_indices, validation_indices, testing_indices = dl.get_split_indices()
+            self.assertEqual((len(training_indices), len(validation_indices), len(testing_indices)), (60, 20, 20))
+            all_indices = np.concatenate((training_indices, validation_indices, testing_indices))
+            self.assertTrue(np.array_equal(np.sort(all_indices), np.arange(100)))
+
 class GetHeaderDataTestCase(BaseDataLoaderTestCase):
     """Provides a test for checking that the header data is the correct size.
 
@@ -262,5 +304,107 @@ class GetHeaderDataTestCase(BaseDataLoaderTestCase):
         h = self.dl.get_header_data()
         self.assertEqual(len(h), 10)
 
+class ReadInChunksTestCase(BaseDataLoaderTestCase):
+    """Provides a test for checking that reading the file in small chunks gives the same data as reading it in one go.
+
+    Inherits from the BaseDataLoaderTestCase.
+    """
+    def runTest(self):
+        """Asserts that a chunk size which does not divide the number of rows gives the same headers and data as the default chunk size.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        headers, data = data_loader.read_gametes_file("tmp.txt")
+        chunked_headers, chunked_data = data_loader.read_gametes_file("tmp.txt", chunk_size=7)
+        self.assertEqual(headers, chunked_headers)
+        self.assertEqual(chunked_data.shape, (100, 10))
+        self.assertEqual(chunked_data.dtype, np.int8)
+        self.assertTrue(np.array_equal(data, chunked_data))
+
+class ReadMalformedFileTestCase(unittest.TestCase):
+    """Provides a test for checking that a file with a missing value is rejected."""
+
+    def setUp(self):
+        """Creates a temporary text file in which one row is missing a column.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with open("tmp_malformed.txt", 'w') as open_file:
+            open_file.write("N1\tM2\tc\n")
+            open_file.write("0\t1\t1\n")
+            open_file.write("2\t0\n")
+
+    def tearDown(self):
+        """Removes the temporary text file created in the set up.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp_malformed.txt")
+
+    def runTest(self):
+        """Asserts that reading the malformed file raises a ValueError.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.assertRaises(ValueError):
+            data_loader.read_gametes_file("tmp_malformed.txt")
+
+class ReadRaggedFileTestCase(unittest.TestCase):
+    """Provides a test for checking that a file with ragged rows is rejected even when its total number of values fills whole rows."""
+
+    def setUp(self):
+        """Creates a temporary text file in which a row with a missing value is followed by a row with an extra value.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with open("tmp_ragged.txt", 'w') as open_file:
+            open_file.write("N1\tM2\tc\n")
+            open_file.write("0\t1\t1\n")
+            open_file.write("2\t0\n")
+            open_file.write("1\t2\t0\t1\n")
+
+    def tearDown(self):
+        """Removes the temporary text file created in the set up.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        remove("tmp_ragged.txt")
+
+    def runTest(self):
+        """Asserts that reading the ragged file raises a ValueError naming the first ragged line.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.assertRaisesRegex(ValueError, "Line 3 "):
+            data_loader.read_gametes_file("tmp_ragged.txt")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,127 @@
+"""This module provides test cases for the DataSplitter class."""
+
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import data_splitter
+
+class BaseDataSplitterTestCase(unittest.TestCase):
+    """Provides a set up function which can be inherited by other test case classes for the DataSplitter."""
+
+    def setUp(self):
+        """Sets up a DataSplitter object initialised with 100 labels of which 20 are cases.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.labels = np.array([1]*20 + [0]*80, dtype=np.int8)
+        self.ds = data_splitter.DataSplitter(self.labels)
+
+class RandomSplitSizesTestCase(BaseDataSplitterTestCase):
+    """Provides a test for checking the sizes and coverage of a random split.
+
+    Inherits from the BaseDataSplitterTestCase.
+    """
+    def runTest(self):
+        """Asserts that a random split has the expected sizes and uses every sample exactly once.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        training, validation, testing = self.ds.random_split(0.8, 0.75)
+        self.assertEqual((len(training), len(validation), len(testing)), (60, 20, 20))
+        self.assertTrue(np.array_equal(np.sort(np.concatenate((training, validation, testing))), np.arange(100)))
+
+class RandomSplitIsReproducableTestCase(BaseDataSplitterTestCase):
+    """Provides a test for checking that a random split is the same every time.
+
+    Inherits from the BaseDataSplitterTestCase.
+    """
+    def runTest(self):
+        """Asserts that two random splits with the same seed are identical.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        for (first, second) in zip(self.ds.random_split(0.8, 0.75), data_splitter.DataSplitter(self.labels).random_split(0.8, 0.75)):
+            self.assertTrue(np.array_equal(first, second))
+
+class StratifiedSplitKeepsClassRatioTestCase(BaseDataSplitterTestCase):
+    """Provides a test for checking that a stratified split keeps the ratio of cases to controls.
+
+    Inherits from the BaseDataSplitterTestCase.
+    """
+    def runTest(self):
+        """Asserts that each set of a stratified split is 20 percent cases and that every sample is used exactly once.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        training, validation, testing = self.ds.stratified_split(0.8, 0.75)
+        self.assertEqual((len(training), len(validation), len(testing)), (60, 20, 20))
+        self.assertEqual(np.sum(self.labels[training]), 12)
+        self.assertEqual(np.sum(self.labels[validation]), 4)
+        self.assertEqual(np.sum(self.labels[testing]), 4)
+        self.assertTrue(np.array_equal(np.sort(np.concatenate((training, validation, testing))), np.arange(100)))
+
+class KFoldSplitTestCase(BaseDataSplitterTestCase):
+    """Provides a test for checking the folds of a stratified k-fold split.
+
+    Inherits from the BaseDataSplitterTestCase.
+    """
+    def runTest(self):
+        """Asserts that every sample is tested in exactly one fold, that the training and testing sets of each fold are disjoint, and that each fold has the same number of cases.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        folds = self.ds.k_fold_split(5)
+        self.assertEqual(len(folds), 5)
+        for (training, testing) in folds:
+            self.assertEqual(len(testing), 20)
+            self.assertEqual(np.sum(self.labels[testing]), 4)
+            self.assertTrue(np.array_equal(np.sort(np.concatenate((training, testing))), np.arange(100)))
+        all_testing = np.concatenate([testing for (_, testing) in folds])
+        self.assertTrue(np.array_equal(np.sort(all_testing), np.arange(100)))
+
+class InvalidNumberOfFoldsTestCase(BaseDataSplitterTestCase):
+    """Provides a test for rejecting an invalid number of folds.
+
+    Inherits from the BaseDataSplitterTestCase.
+    """
+    def runTest(self):
+        """Asserts that asking for fewer than 2 or more folds than samples raises a ValueError.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.assertRaises(ValueError):
+            self.ds.k_fold_split(1)
+        with self.assertRaises(ValueError):
+            self.ds.k_fold_split(101)
+
+if __name__ == "__main__":
+    unittest.main()
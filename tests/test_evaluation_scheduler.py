@@ -0,0 +1,69 @@
+"""This module provides test cases for the EvaluationScheduler class."""
+
+import sys
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import evaluation_scheduler
+
+class EvaluationSchedulerTest(tf.test.TestCase):
+    """Tests for the EvaluationScheduler class
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def setUp(self):
+        """Sets up a graph which multiplies an input by a variable, and the cached data to evaluate it on.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.x = tf.placeholder(tf.float32, [None])
+        self.weight = tf.Variable(2.0)
+        self.output = tf.reduce_sum(self.x*self.weight)
+        self.feed_dict = {self.x: np.array([1.0, 2.0, 3.0], dtype=np.float32)}
+
+    def testSynchronousEvaluation(self):
+        """Asserts that evaluations are due at every interval and that a synchronous evaluation's results are available straight away.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.test_session() as sess:
+            sess.run(tf.initialize_all_variables())
+            evaluator = evaluation_scheduler.EvaluationScheduler(sess, [self.output], self.feed_dict, interval=5)
+            self.assertEqual([step for step in range(12) if evaluator.is_due(step)], [0, 5, 10])
+            evaluator.evaluate(0)
+            self.assertEqual(evaluator.get_results(), [(0, [12.0], None)])
+            self.assertEqual(evaluator.get_results(), [])
+
+    def testAsynchronousEvaluationUsesSnapshot(self):
+        """Asserts that an asynchronous evaluation uses, and returns, the values the variables had when it was requested.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        with self.test_session() as sess:
+            sess.run(tf.initialize_all_variables())
+            evaluator = evaluation_scheduler.EvaluationScheduler(sess, [self.output], self.feed_dict, asynchronous=True)
+            evaluator.evaluate(0)
+            sess.run(self.weight.assign(10.0))
+            evaluator.stop()
+            self.assertEqual(evaluator.get_results(), [(0, [12.0], [2.0])])
+
+if __name__ == "__main__":
+    unittest.main()
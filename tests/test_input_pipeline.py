@@ -0,0 +1,69 @@
+"""This module provides test cases for the InputPipeline class."""
+
+import sys
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import data_batcher
+import input_pipeline
+
+class InputPipelineTest(tf.test.TestCase):
+    """Tests for the InputPipeline class
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def setUp(self):
+        """Sets up a DataBatcher containing 10 samples whose values are their sample numbers.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.x = np.tile(np.arange(10, dtype=np.float32).reshape(10, 1, 1), (1, 4, 3))
+        self.y1 = np.tile(np.arange(10, dtype=np.float32).reshape(10, 1), (1, 2))
+        self.y2 = np.tile(np.arange(10, dtype=np.float32).reshape(10, 1, 1), (1, 4, 2))
+
+    def testDequeuedBatchesMatchDataBatcher(self):
+        """Asserts that a single reader thread enqueues the same batches, in the same order, as the DataBatcher returns.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        pipeline = input_pipeline.InputPipeline(data_batcher.DataBatcher(self.x, self.y1, self.y2), 3, num_threads=1)
+        x, y1, y2 = pipeline.get_inputs()
+        expected_db = data_batcher.DataBatcher(self.x, self.y1, self.y2)
+        with self.test_session() as sess:
+            pipeline.start(sess)
+            for _ in range(5):
+                for (expected, actual) in zip(expected_db.next_batch(3), sess.run([x, y1, y2])):
+                    self.assertAllEqual(expected, actual)
+            pipeline.stop(sess)
+
+    def testFedInputsAreUsedInsteadOfTheQueue(self):
+        """Asserts that inputs given in a feed_dict are used without dequeuing, even when the reader threads have not been started.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        pipeline = input_pipeline.InputPipeline(data_batcher.DataBatcher(self.x, self.y1, self.y2), 3)
+        x, y1, y2 = pipeline.get_inputs()
+        with self.test_session() as sess:
+            fed_x = sess.run(tf.reduce_sum(x), feed_dict={x: self.x, y1: self.y1, y2: self.y2})
+            self.assertNear(fed_x, np.sum(self.x), err=1e-3)
+
+if __name__ == "__main__":
+    unittest.main()
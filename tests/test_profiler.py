@@ -0,0 +1,58 @@
+"""This module provides test cases for the Profiler class."""
+
+import sys
+import unittest
+
+import tensorflow as tf
+from tensorflow.core.framework import step_stats_pb2
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import profiler
+
+class ProfilerTest(tf.test.TestCase):
+    """Tests for the Profiler class
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testTracedSteps(self):
+        """Asserts that tracing is off by default and that only every trace_every-th step is traced.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        self.assertFalse(profiler.Profiler().is_enabled())
+        self.assertEqual(profiler.Profiler().get_run_args(99), {})
+        profile = profiler.Profiler(trace_every=50)
+        self.assertEqual([step for step in range(200) if profile.is_traced(step)], [49, 99, 149, 199])
+        self.assertIn('run_metadata', profile.get_run_args(49))
+
+    def testCostIsAggregatedPerScope(self):
+        """Asserts that the compute time of every operation is added to its top level scope and averaged over the traced steps.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        step_stats = step_stats_pb2.StepStats()
+        device_stats = step_stats.dev_stats.add()
+        for (node_name, micros) in [('conv_1/Conv2D', 30), ('conv_1/Relu', 10), ('hidden_1/MatMul', 100)]:
+            node_stats = device_stats.node_stats.add()
+            node_stats.node_name = node_name
+            node_stats.all_end_rel_micros = micros
+
+        profile = profiler.Profiler(trace_every=1)
+        profile.add_step_stats(step_stats)
+        profile.add_step_stats(step_stats)
+        self.assertEqual([(scope, time) for (scope, time, _, _) in profile.get_summary()], [('hidden_1', 100.0), ('conv_1', 40.0)])
+        self.assertIn('hidden_1', profile.format_summary())
+
+if __name__ == "__main__":
+    unittest.main()
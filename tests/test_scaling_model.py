@@ -0,0 +1,48 @@
+"""This module provides test cases for the ScalingModel class."""
+
+import sys
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import scaling_model
+
+class ScalingModelTest(tf.test.TestCase):
+    """Tests for the ScalingModel class
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testLocalHeadWithWidePanel(self):
+        """Asserts that a ScalingModel with the local output head builds and runs on a panel whose size does not divide its 100 unit bottleneck.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        num_snps = 1234
+        x = tf.placeholder(tf.float32, [None, num_snps, 3])
+        y1_ = tf.placeholder(tf.float32, [None, 2])
+        y2_ = tf.placeholder(tf.float32, [None, num_snps, 2])
+        model = scaling_model.ScalingModel(x, y1_, y2_, 0.001, output_head='local')
+
+        random_state = np.random.RandomState(42)
+        x_data = np.eye(3)[random_state.randint(3, size=(4, num_snps))]
+        y1_data = np.eye(2)[random_state.randint(2, size=4)]
+        y2_data = np.eye(2)[random_state.randint(2, size=(4, num_snps))]
+        feed_dict = {x: x_data, y1_: y1_data, y2_: y2_data, model.get_keep_prob(): 1.0}
+        with self.test_session() as sess:
+            sess.run(tf.initialize_all_variables())
+            sess.run(model.get_train_step(), feed_dict=feed_dict)
+            probability_sums, counts = sess.run(model.get_snp_scores(), feed_dict=feed_dict)
+            self.assertEqual(probability_sums.shape, (num_snps,))
+            self.assertEqual(counts.shape, (num_snps,))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""This module provides test cases for the SnpScorer class."""
+
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append("../src/")
+sys.path.append("src/")
+
+import snp_scorer
+
+class BaseSnpScorerTestCase(unittest.TestCase):
+    """Provides a set up function which can be inherited by other test case classes for the SnpScorer."""
+
+    def setUp(self):
+        """Sets up the output 2 probabilities of 4 samples over 3 SNPs.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        causing_probs = np.array([[0.9, 0.2, 0.6], [0.8, 0.1, 0.4], [0.3, 0.7, 0.5], [0.6, 0.1, 0.2]])
+        self.probs = np.stack((causing_probs, 1 - causing_probs), axis=-1)
+
+class ScoresOfBatchesMatchScoresOfWholeTestCase(BaseSnpScorerTestCase):
+    """Provides a test for streaming the scores of several batches.
+
+    Inherits from the BaseSnpScorerTestCase.
+    """
+    def runTest(self):
+        """Asserts that scoring the samples in two batches gives the same counts and mean probabilities as scoring them at once.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        whole = snp_scorer.SnpScorer()
+        whole.update_from_probs(self.probs)
+        streamed = snp_scorer.SnpScorer()
+        streamed.update_from_probs(self.probs[:3])
+        streamed.update(np.sum(self.probs[3:, :, 0], axis=0), [1, 0, 0], 1)
+        self.assertEqual(streamed.get_num_samples(), 4)
+        self.assertTrue(np.array_equal(streamed.get_counts(), [3, 1, 2]))
+        self.assertTrue(np.array_equal(whole.get_counts(), streamed.get_counts()))
+        self.assertTrue(np.allclose(streamed.get_mean_probs(), [0.65, 0.275, 0.425]))
+
+class RankOrdersByCountThenMeanTestCase(BaseSnpScorerTestCase):
+    """Provides a test for ranking the SNPs.
+
+    Inherits from the BaseSnpScorerTestCase.
+    """
+    def runTest(self):
+        """Asserts that the SNPs are ranked by count then mean probability, and that k and min_count limit the ranking.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        scorer = snp_scorer.SnpScorer(cut_off_prob=0.6)
+        scorer.update_from_probs(self.probs[..., :1], already_split=True)
+        snps, counts, _ = scorer.rank()
+        self.assertTrue(np.array_equal(snps, [0, 2, 1]))
+        self.assertTrue(np.array_equal(counts, [3, 1, 1]))
+        snps, _, mean_probs = scorer.rank(k=2)
+        self.assertTrue(np.array_equal(snps, [0, 2]))
+        self.assertTrue(np.allclose(mean_probs, [0.65, 0.425]))
+        scorer.reset()
+        scorer.update_from_probs(np.zeros((2, 3, 2)))
+        self.assertEqual(len(scorer.rank()[0]), 0)
+        self.assertTrue(np.array_equal(scorer.rank(min_count=0)[0], [0, 1, 2]))
+
+if __name__ == "__main__":
+    unittest.main()
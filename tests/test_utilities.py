@@ -377,6 +377,59 @@ class PoolLayerTest(tf.test.TestCase):
             op_dict = {"pool_1/max_pooling/MaxPool": "MaxPool"}
             tf.python.framework.test_util.assert_ops_in_graph(op_dict, tf.get_default_graph())
 
+class SnpOutputLayerTest(tf.test.TestCase):
+    """Tests for the snp_output_layer function
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testHeadsGiveSameShape(self):
+        """Provides a test for checking that every output head gives logits of shape [batch, snps, states] and that the factorized and local heads use fewer weights
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        num_weights = {}
+        for head in ['dense', 'factorized', 'local']:
+            with tf.Graph().as_default():
+                logits = utilities.snp_output_layer(tf.ones([4, 60]), 60, 10, 2, head=head, rank=3)
+                self.assertEqual([4, 10, 2], logits.get_shape().as_list())
+                num_weights[head] = sum(np.prod(variable.get_shape().as_list()) for variable in tf.trainable_variables())
+        self.assertEqual(60*20 + 20, num_weights['dense'])
+        self.assertEqual(60*3 + 3 + 3*20 + 20, num_weights['factorized'])
+        self.assertEqual(10*6*2 + 20, num_weights['local'])
+        with self.assertRaises(ValueError):
+            utilities.snp_output_layer(tf.ones([4, 60]), 60, 10, 2, head='unknown')
+
+    def testLocalHeadOnlySeesItsOwnWindow(self):
+        """Provides a test for checking that the local head works when the input dimension does not divide by the number of snps, and that each snp's logits only depend on its own window of inputs
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        x = tf.placeholder(tf.float32, [None, 5])
+        logits = utilities.snp_output_layer(x, 5, 3, 2, head='local')
+        weights, biases = tf.trainable_variables()
+        self.assertEqual([3, 2, 2], weights.get_shape().as_list())
+        x_data = np.arange(10, dtype=np.float32).reshape(2, 5)
+        changed_x_data = x_data.copy()
+        changed_x_data[:, 4] += 1
+        with self.test_session() as sess:
+            sess.run(tf.initialize_all_variables())
+            weight_values, bias_values, base = sess.run([weights, biases, logits], feed_dict={x: x_data})
+            changed = sess.run(logits, feed_dict={x: changed_x_data})
+            # the windows of the 3 snps start at inputs 0, 1 and 3
+            windows = np.stack([x_data[:, 0:2], x_data[:, 1:3], x_data[:, 3:5]], axis=1)
+            self.assertAllClose(np.einsum('bsw,swn->bsn', windows, weight_values) + bias_values, base, rtol=1e-5, atol=1e-5)
+            self.assertAllClose(base[:, :2], changed[:, :2])
+            self.assertFalse(np.allclose(base[:, 2], changed[:, 2]))
+
 class DropoutLayerTest(tf.test.TestCase):
     """Tests to check the dropout function
 
@@ -438,6 +491,88 @@ class CalculateCrossEntropyTest(tf.test.TestCase):
             op_dict = {"cross_entropy_1/add": "Add", "cross_entropy_1/Log": "Log", "cross_entropy_1/mul": "Mul", "cross_entropy_1/total/Mean": "Mean", "cross_entropy_1/total/Neg": "Neg"}
             tf.python.framework.test_util.assert_ops_in_graph(op_dict, tf.get_default_graph())
 
+class CalculateSoftmaxCrossEntropyTest(tf.test.TestCase):
+    """Tests for calculate_softmax_cross_entropy function.
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testMatchesCrossEntropyOfSoftmax(self):
+        """Provides a test for checking that the fused cross entropy of logits equals calculate_cross_entropy of their softmax.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        logits = tf.constant([[[2.0, -1.0], [0.5, 0.5], [-3.0, 4.0]], [[1.0, 0.0], [0.0, 1.0], [10.0, -10.0]]])
+        labels = tf.constant([[[1, 0], [0, 1], [0, 1]], [[0, 1], [0, 1], [1, 0]]], dtype=tf.float32)
+        probabilities = tf.reshape(tf.nn.softmax(tf.reshape(logits, [-1, 2])), [-1, 3, 2])
+        expected = utilities.calculate_cross_entropy(probabilities, labels, name_suffix='1')
+        fused = utilities.calculate_softmax_cross_entropy(logits, labels, name_suffix='2')
+        with self.test_session() as sess:
+            expected_value, fused_value = sess.run([expected, fused])
+            self.assertNear(expected_value, fused_value, err=1e-5)
+
+class CalculateSigmoidCrossEntropyTest(tf.test.TestCase):
+    """Tests for calculate_sigmoid_cross_entropy function.
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testMatchesCrossEntropyOfTwoStateSoftmax(self):
+        """Provides a test for checking that the sigmoid cross entropy of one logit per snp equals calculate_cross_entropy of the softmax of the logit and zero.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        logits = tf.constant([[[2.0], [0.5], [-3.0]], [[1.0], [0.0], [10.0]]])
+        labels = tf.constant([[[1, 0], [0, 1], [0, 1]], [[0, 1], [0, 1], [1, 0]]], dtype=tf.float32)
+        probabilities = tf.reshape(tf.nn.softmax(tf.reshape(tf.concat(2, [logits, tf.zeros_like(logits)]), [-1, 2])), [-1, 3, 2])
+        expected = utilities.calculate_cross_entropy(probabilities, labels, name_suffix='1')
+        binary = utilities.calculate_sigmoid_cross_entropy(logits, labels, name_suffix='2')
+        binary_labels = utilities.calculate_sigmoid_cross_entropy(logits, utilities.get_causing_epi_probs(labels), name_suffix='3')
+        with self.test_session() as sess:
+            expected_value, binary_value, binary_labels_value = sess.run([expected, binary, binary_labels])
+            self.assertNear(expected_value, binary_value, err=1e-5)
+            self.assertNear(expected_value, binary_labels_value, err=1e-5)
+
+class SelectLossesTest(tf.test.TestCase):
+    """Tests for the select_losses function.
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testLossesMatchTheChosenCrossEntropies(self):
+        """Provides a test for checking that the plain, fused and binary head losses equal the cross entropies they select.
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        logits1 = tf.constant([[2.0, -1.0], [0.5, 0.5]])
+        logits2 = tf.constant([[[2.0, 0.0], [0.5, 1.0]], [[-1.0, 3.0], [0.0, 0.0]]])
+        y1_ = tf.constant([[1, 0], [0, 1]], dtype=tf.float32)
+        y2_ = tf.constant([[[1, 0], [0, 1]], [[0, 1], [1, 0]]], dtype=tf.float32)
+        output1 = tf.nn.softmax(logits1)
+        output2 = tf.reshape(tf.nn.softmax(tf.reshape(logits2, [-1, 2])), [-1, 2, 2])
+        binary_logits2 = tf.slice(logits2, [0, 0, 0], [-1, -1, 1])
+        plain = utilities.select_losses(logits1, logits2, output1, output2, y1_, y2_)
+        fused = utilities.select_losses(logits1, logits2, output1, output2, y1_, y2_, fused_loss=True)
+        binary = utilities.select_losses(logits1, binary_logits2, output1, tf.sigmoid(binary_logits2), y1_, y2_, binary_snp_head=True)
+        expected_binary_loss2 = utilities.calculate_sigmoid_cross_entropy(binary_logits2, y2_, name_suffix='2')
+        with self.test_session() as sess:
+            plain_value, fused_value, binary_value, expected_value = sess.run([plain, fused, binary, expected_binary_loss2])
+            self.assertAllClose(plain_value, fused_value, rtol=1e-5, atol=1e-5)
+            self.assertNear(plain_value[0], binary_value[0], err=1e-5)
+            self.assertNear(expected_value, binary_value[1], err=1e-5)
+
 class CalculateEpiAccuracyTest(tf.test.TestCase):
     """Tests for the calculate_epi_accuracy function
 
@@ -498,6 +633,21 @@ class CalculateSnpAccuracyTest(tf.test.TestCase):
             sess.run(tf.initialize_all_variables())
             self.assertAlmostEqual(0.4, sess.run(output_accuracy))
 
+    def testSnpPredictionCounts(self):
+        """Provides a test for checking that the function count_snp_predictions() counts the true positives, false positives and false negatives
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        input_tensor = tf.constant([[[1], [0.9], [0.8], [0.6]], [[1], [0.9], [0.8], [0.6]]], dtype=tf.float32)
+        input_labels = tf.constant([[[1, 0], [0, 1], [0, 1], [0, 1]], [[1, 0], [0, 1], [0, 1], [1, 0]]], dtype=tf.float32)
+        counts = utilities.count_snp_predictions(input_tensor, input_labels, cut_off_prob=0.9, already_split=True)
+        with self.test_session() as sess:
+            self.assertEqual([2, 2, 1], sess.run(list(counts)))
+
 class PredictSnpsTest(tf.test.TestCase):
     """Tests for the predict_snps function
 
@@ -564,6 +714,27 @@ class PredictSnpsTest(tf.test.TestCase):
             sess.run(tf.initialize_all_variables())
             self.assertAllEqual(np.array([1, 2]), sess.run(count))
 
+class ScoreSnpsTest(tf.test.TestCase):
+    """Tests for the score_snps function
+
+    Inherits from the tf.test.TestCase class.
+    """
+
+    def testScoresForTwoClassifier(self):
+        """Provides a test for checking that the function score_snps() sums the probabilities and counts the predictions of each snp over the batch
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        input_tensor = tf.constant([[[0.5, 0.8], [0.2, 0.8], [0.9, 0.1]], [[0.2, 0.8], [0.49, 0.8], [0.51, 0.49]]])
+        probability_sums, counts = utilities.score_snps(input_tensor, 0.5)
+        with self.test_session() as sess:
+            self.assertAllClose(np.array([0.7, 0.69, 1.41]), sess.run(probability_sums))
+            self.assertAllEqual(np.array([1, 0, 2]), sess.run(counts))
+
 class GetOutputSnpHeadersTest(unittest.TestCase):
     """Provides a test for checking that the correct snp headers are returned from the snp numbers
 
@@ -582,6 +753,21 @@ class GetOutputSnpHeadersTest(unittest.TestCase):
         snp_indices = np.array([0, 3, 4])
         self.assertTrue(np.array_equal(utilities.get_snp_headers(snp_indices, headers), np.array(['MP01', 'MP02', 'MP03'])))
 
+    def testHeaderRanking(self):
+        """Asserts that the function rank_snp_headers orders the header names, indices and counts by count, keeping the order of ties
+
+        Arguments:
+            Nothing.
+
+        Returns:
+            Nothing.
+        """
+        headers = ['MP01', 'N0', 'N1', 'MP02', 'MP03']
+        names, indices, counts = utilities.rank_snp_headers(np.array([0, 3, 4, 1]), np.array([2, 5, 2, 7]), headers)
+        self.assertTrue(np.array_equal(names, np.array(['N0', 'MP02', 'MP01', 'MP03'])))
+        self.assertTrue(np.array_equal(indices, np.array([1, 3, 0, 4])))
+        self.assertTrue(np.array_equal(counts, np.array([7, 5, 2, 2])))
+
 class GetCausingEpiProbsTest(tf.test.TestCase):
     """Tests for the get_causing_epi() function
 